@@ -0,0 +1,89 @@
+"""Measure the per-message cost of decoding and logging MQTT payloads.
+
+Compares the original ingest path (``json.loads(payload.decode())`` followed by
+an info and a debug log line per message) with the current one
+(``CentrometalMQTTClient._process_message``: direct bytes decoding, orjson when
+installed, sampled debug logging). Each variant is timed with the integration
+logger at WARNING, Home Assistant's default, and at INFO, where the original
+info line was written for every message.
+
+Needs a Home Assistant development environment (``pip install homeassistant``).
+Run from the repository root:
+
+    python benchmarks/decode_bench.py
+    python benchmarks/decode_bench.py --messages 20000 --repeat 7
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.centrometal import CentrometalMQTTClient  # noqa: E402
+from custom_components.centrometal import _LOGGER  # noqa: E402
+from custom_components.centrometal.decoder import decode_json, orjson  # noqa: E402
+from mqtt_replay import TOPIC, synthetic_payloads  # noqa: E402
+
+
+def original_path(messages: list, data: dict) -> None:
+    """Decode and log the way the integration did before."""
+    for raw in messages:
+        payload = json.loads(raw.decode())
+        _LOGGER.info("MQTT message received on %s with %d fields", TOPIC, len(payload))
+        _LOGGER.debug("MQTT payload: %s", payload)
+        data.update(payload)
+
+
+def current_path(client: CentrometalMQTTClient, messages: list) -> None:
+    """Decode and log through the integration's ingest path."""
+    for raw in messages:
+        client._process_message(TOPIC, raw)
+    client.async_drain()
+
+
+def time_per_message(func, count: int, repeat: int) -> float:
+    """Return the best time per message in microseconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) / count * 1e6
+
+
+def main() -> None:
+    """Run the comparison and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--messages", type=int, default=5000, help="messages per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant, the best one counts")
+    args = parser.parse_args()
+
+    messages = list(synthetic_payloads(args.messages))
+
+    # Format log records for real, but into memory
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s (%(threadName)s) [%(name)s] %(message)s"))
+    _LOGGER.addHandler(handler)
+    _LOGGER.propagate = False
+
+    variants = [("original", None)]
+    variants.append(("current, json", decode_json))
+    if orjson is not None:
+        variants.append(("current, orjson", orjson.loads))
+
+    print(f"{'variant':20} {'WARNING us/msg':>15} {'INFO us/msg':>12}")
+    for name, decoder in variants:
+        row = []
+        for level in (logging.WARNING, logging.INFO):
+            _LOGGER.setLevel(level)
+            if decoder is None:
+                data = {}
+                row.append(time_per_message(lambda: original_path(messages, data), args.messages, args.repeat))
+            else:
+                client = CentrometalMQTTClient(None, "bench", "BENCH001")
+                client.decode = decoder
+                row.append(time_per_message(lambda: current_path(client, messages), args.messages, args.repeat))
+        print(f"{name:20} {row[0]:15.2f} {row[1]:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Replay MQTT payloads through the Centrometal integration and measure the hot path.
+
+Feeds recorded or synthetic ``cm/inst/biotec/*`` messages through
+``CentrometalMQTTClient`` and the coordinator into real sensor entities, with
+the portal replaced by a local aiohttp test server. Reports messages per
+second, per-message latency up to the entity state writes, bytes allocated per
+message and event loop blocking.
+
+Needs a Home Assistant development environment (``pip install homeassistant``).
+Run from the repository root:
+
+    python benchmarks/mqtt_replay.py --messages 5000
+    python benchmarks/mqtt_replay.py --rate 20 --transport paho
+    python benchmarks/mqtt_replay.py --recording capture.txt --trace-alloc
+
+Recordings use the ``mosquitto_sub -v`` format, one ``<topic> <json>`` per line:
+
+    mosquitto_sub -h 136.243.62.164 -u appuser -P appuser -t 'cm/inst/biotec/#' -v > capture.txt
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import frame  # noqa: E402
+
+from custom_components.centrometal import (  # noqa: E402
+    CentrometalDataUpdateCoordinator,
+    CentrometalMQTTClient,
+)
+from custom_components.centrometal import api as api_module  # noqa: E402
+from custom_components.centrometal.api import CentrometalAPI  # noqa: E402
+from custom_components.centrometal.cache import CentrometalStateCache  # noqa: E402
+from custom_components.centrometal.filters import DeadbandFilter  # noqa: E402
+from custom_components.centrometal.const import (  # noqa: E402
+    DEFAULT_INSTALL_ID,
+    MQTT_TRANSPORT_ASYNCIO,
+    MQTT_TRANSPORT_PAHO,
+)
+from custom_components.centrometal.sensor import CentrometalSensor  # noqa: E402
+from custom_components.centrometal.sensor_definitions import ALL_SENSORS  # noqa: E402
+
+DEVICE_ID = "BENCH001"
+TOPIC = f"cm/inst/biotec/{DEVICE_ID}"
+
+# Key carrying the message sequence number, listened to after all entities
+PROBE_KEY = "_bench_seq"
+
+# Event loop lag below this is not counted as blocking (seconds)
+LAG_TICK = 0.001
+
+
+def synthetic_payloads(count: int, seed: int = 1):
+    """Yield payloads shaped like BioTec-L status messages."""
+    rng = random.Random(seed)
+    state = {key: 0 for key in ALL_SENSORS if not key.startswith("PVAL_")}
+    state.update({"B_Tk1": 68.0, "B_Tdpl1": 140.0, "B_Tlo1": 420.0, "B_Oxy1": 9.0, "B_fan": 1800})
+    state.update({"B_STATE": "S7-2", "B_PRODNAME": "BioTec-L", "B_sng": "25"})
+
+    for seq in range(count):
+        if seq % 200 == 0:
+            # Periodic full dump, like after a REFRESH
+            payload = dict(state)
+        else:
+            payload = {}
+            for key in rng.sample(sorted(state), 8):
+                value = state[key]
+                if isinstance(value, float):
+                    value = round(value + rng.uniform(-0.3, 0.3), 1)
+                elif key.startswith("CNT_"):
+                    value += rng.randint(0, 1)
+                elif isinstance(value, int):
+                    value = rng.choice((0, 1)) if value in (0, 1) else value + rng.randint(-20, 20)
+                state[key] = payload[key] = value
+        yield json.dumps(payload).encode()
+
+
+def recorded_payloads(path: str, count: int):
+    """Yield payloads from a mosquitto_sub -v capture, cycling if needed."""
+    with open(path, encoding="utf-8") as capture:
+        payloads = [line.split(" ", 1)[1].strip().encode() for line in capture if " " in line]
+    if not payloads:
+        raise SystemExit(f"No payloads found in {path}")
+    for seq in range(count):
+        yield payloads[seq % len(payloads)]
+
+
+def with_probe(raw: bytes, seq: int) -> bytes:
+    """Add the sequence probe key as the last key of a payload."""
+    payload = json.loads(raw)
+    payload[PROBE_KEY] = seq
+    return json.dumps(payload).encode()
+
+
+async def start_portal() -> TestServer:
+    """Start a local stand-in for the portal endpoints in const.py."""
+    params = {
+        "PVAL_3_0": {"v": "80", "ut": "1"},
+        "PVAL_10_0": {"v": "55", "ut": "1"},
+        "PVAL_99_0": {"v": "1", "ut": "1"},
+        "PVAL_129_0": {"v": "0", "ut": "1"},
+        "PVAL_140_0": {"v": "21.5", "ut": "1"},
+    }
+
+    async def login_page(request):
+        return web.Response(text='<input type="hidden" name="_csrf_token" value="bench">', content_type="text/html")
+
+    async def login_check(request):
+        raise web.HTTPFound("/")
+
+    async def control(request):
+        await request.json()
+        return web.json_response({"status": "success"})
+
+    async def status(request):
+        return web.json_response({"params": params})
+
+    app = web.Application()
+    app.router.add_get("/login", login_page)
+    app.router.add_post("/login_check", login_check)
+    app.router.add_post("/api/inst/control/multiple", control)
+    app.router.add_get("/wdata/data/installation-status/{install_id}", status)
+
+    server = TestServer(app)
+    await server.start_server()
+
+    base = str(server.make_url("")).rstrip("/")
+    api_module.LOGIN_PAGE = base + "/login"
+    api_module.LOGIN_POST = base + "/login_check"
+    api_module.API_CONTROL = base + "/api/inst/control/multiple"
+    api_module.API_STATUS = base + "/wdata/data/installation-status/{install_id}"
+    return server
+
+
+async def measure_lag(stop: asyncio.Event, lags: list) -> None:
+    """Record how late the loop wakes up a frequent timer."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_TICK)
+        lag = loop.time() - start - LAG_TICK
+        if lag > LAG_TICK:
+            lags.append(lag)
+
+
+def percentile(values: list, pct: float) -> float:
+    """Return the pct percentile of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(args) -> dict:
+    """Run one benchmark and return the results."""
+    config_dir = tempfile.mkdtemp(prefix="centrometal-bench-")
+    hass = HomeAssistant(config_dir)
+    if hasattr(frame, "async_setup"):
+        frame.async_setup(hass)
+    await hass.async_start()
+
+    portal = await start_portal()
+    entry = SimpleNamespace(entry_id="bench", data={"device_id": DEVICE_ID, "install_id": DEFAULT_INSTALL_ID}, options={})
+
+    api = CentrometalAPI("bench@example.com", "bench", DEFAULT_INSTALL_ID)
+    mqtt_client = CentrometalMQTTClient(hass, DEFAULT_INSTALL_ID, DEVICE_ID, args.transport)
+    value_filter = DeadbandFilter.from_options() if args.filter else None
+    coordinator = CentrometalDataUpdateCoordinator(
+        hass, api, mqtt_client, CentrometalStateCache(hass, entry.entry_id), value_filter
+    )
+    await coordinator.async_refresh()
+
+    # Real sensor entities; a state write renders the state and stores it in the state machine
+    writes = 0
+
+    def make_writer(entity):
+        def write_state():
+            nonlocal writes
+            writes += 1
+            hass.states.async_set(entity.entity_id, entity.state, entity.extra_state_attributes)
+        return write_state
+
+    for key, config in ALL_SENSORS.items():
+        sensor = CentrometalSensor(coordinator, entry, key, config)
+        sensor.hass = hass
+        sensor.entity_id = f"sensor.centrometal_{key.lower()}"
+        sensor.async_write_ha_state = make_writer(sensor)
+        coordinator.async_add_key_listener(key, sensor._handle_key_update)
+
+    # (seq, send time) of the messages not yet written, in send order; the
+    # feeder thread appends while the loop pops, which deque allows without a lock
+    sent_at = deque()
+    latencies = []
+    done = asyncio.Event()
+    total = args.messages
+
+    def probe():
+        # A drained batch only shows its last seq, every older one arrived with it
+        seq = coordinator.data.get(PROBE_KEY)
+        now = time.perf_counter()
+        while sent_at and sent_at[0][0] <= seq:
+            latencies.append(now - sent_at.popleft()[1])
+        if seq == total - 1:
+            done.set()
+
+    coordinator.async_add_key_listener(PROBE_KEY, probe)
+
+    if args.recording:
+        source = recorded_payloads(args.recording, total)
+    else:
+        source = synthetic_payloads(total)
+    messages = [with_probe(raw, seq) for seq, raw in enumerate(source)]
+    interval = 1 / args.rate if args.rate else 0
+
+    lags = []
+    stop_lag = asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(stop_lag, lags))
+
+    # Peak traced memory above the starting point while one message is handled,
+    # from decode to the last state write (asyncio only, paho splits a message
+    # between the feeder thread and the loop)
+    alloc_bytes = []
+    if args.trace_alloc:
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    if args.transport == MQTT_TRANSPORT_PAHO:
+        # Feed from a thread, the way paho's network loop does
+        def feed():
+            for seq, raw in enumerate(messages):
+                sent_at.append((seq, time.perf_counter()))
+                mqtt_client._on_message(TOPIC, raw)
+                if interval:
+                    time.sleep(interval)
+
+        feeder = threading.Thread(target=feed, name="bench-feeder")
+        feeder.start()
+        await hass.async_add_executor_job(feeder.join)
+    else:
+        for seq, raw in enumerate(messages):
+            sent_at.append((seq, time.perf_counter()))
+            if args.trace_alloc:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                mqtt_client._async_on_message(TOPIC, raw)
+                alloc_bytes.append(tracemalloc.get_traced_memory()[1] - before)
+            else:
+                mqtt_client._async_on_message(TOPIC, raw)
+            if args.poll_every and seq and seq % args.poll_every == 0:
+                await coordinator.async_refresh()
+            await asyncio.sleep(interval)
+
+    try:
+        await asyncio.wait_for(done.wait(), 30)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - started
+
+    results = {
+        "transport": args.transport,
+        "messages": total,
+        "elapsed_s": round(elapsed, 3),
+        "messages_per_s": round(total / elapsed, 1),
+        "state_writes": writes,
+        "state_writes_per_message": round(writes / total, 2),
+        "latency_ms_p50": round(percentile(latencies, 50) * 1000, 3),
+        "latency_ms_p99": round(percentile(latencies, 99) * 1000, 3),
+        "latency_ms_max": round(max(latencies, default=0) * 1000, 3),
+        "latency_ms_mean": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "loop_blocked_ms_total": round(sum(lags) * 1000, 1),
+        "loop_blocked_ms_max": round(max(lags, default=0) * 1000, 3),
+    }
+    if value_filter is not None:
+        results["deadband_suppressed"] = value_filter.suppressed
+
+    if args.trace_alloc:
+        tracemalloc.stop()
+        results["alloc_bytes_per_message_mean"] = round(statistics.fmean(alloc_bytes), 1)
+        results["alloc_bytes_per_message_p99"] = percentile(alloc_bytes, 99)
+        results["alloc_bytes_per_message_max"] = max(alloc_bytes)
+
+    stop_lag.set()
+    await lag_task
+    await api.close()
+    await portal.close()
+    await coordinator.async_shutdown()
+    await hass.async_stop()
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--messages", type=int, default=2000, help="number of messages to replay")
+    parser.add_argument("--rate", type=float, default=0, help="messages per second, 0 for as fast as possible")
+    parser.add_argument(
+        "--transport",
+        choices=(MQTT_TRANSPORT_ASYNCIO, MQTT_TRANSPORT_PAHO),
+        default=MQTT_TRANSPORT_ASYNCIO,
+        help="feed on the event loop (asyncio) or from a thread (paho)",
+    )
+    parser.add_argument("--recording", help="mosquitto_sub -v capture to replay instead of synthetic payloads")
+    parser.add_argument("--poll-every", type=int, default=0, help="run a portal poll every N messages (asyncio only)")
+    parser.add_argument("--filter", action="store_true", help="apply the default deadband filter")
+    parser.add_argument("--trace-alloc", action="store_true", help="report bytes allocated per message (slow)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    if args.trace_alloc and args.transport != MQTT_TRANSPORT_ASYNCIO:
+        parser.error("--trace-alloc needs --transport asyncio")
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for key, value in results.items():
+            print(f"{key:32} {value}")
+
+
+if __name__ == "__main__":
+    main()
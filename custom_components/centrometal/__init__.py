@@ -2,21 +2,138 @@
 import asyncio
 import json
 import logging
+import math
+import os
+import time
+from collections import deque
 from datetime import timedelta
+from functools import partial
 
+import aiohttp
 import paho.mqtt.client as mqtt
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
 
+from .aggregates import AggregateTracker, parse_windows
 from .api import CentrometalAPI
-from .const import DOMAIN, MQTT_BROKER, MQTT_PASS, MQTT_PORT, MQTT_USER, DEFAULT_INSTALL_ID
+from .cache import CentrometalStateCache
+from .const import (
+    AGGREGATE_ROLL_INTERVAL,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END,
+    ATTR_KEYS,
+    ATTR_START,
+    CONF_AGGREGATE_WINDOWS,
+    CONF_CACHE_MAX_AGE,
+    CONF_DEADBANDS,
+    CONF_HEARTBEAT,
+    CONF_HISTORY_HOURS,
+    CONF_HISTORY_SPILL,
+    CONF_MQTT_TRANSPORT,
+    CONF_STALE_AFTER,
+    CONF_TRACK_COMMANDS,
+    CONNECTION_KEY,
+    DATA_API_CLIENTS,
+    DEADBAND_FLUSH_INTERVAL,
+    DATA_MQTT_HUB,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_INSTALL_ID,
+    DEFAULT_MQTT_TRANSPORT,
+    DEFAULT_STALE_AFTER,
+    DOMAIN,
+    MQTT_BROKER,
+    MQTT_FRESH_SECONDS,
+    MQTT_LOG_SAMPLE,
+    MQTT_PASS,
+    MQTT_PORT,
+    MQTT_TRANSPORT_ASYNCIO,
+    MQTT_USER,
+    OPTIMISTIC_TIMEOUT,
+    POLL_INTERVAL_MAX,
+    POLL_INTERVAL_MIN,
+    SERVICE_GET_HISTORY,
+    WATCHDOG_INTERVAL,
+    WATCHDOG_REFRESH_GRACE,
+)
+from .decoder import decode_payload
+from .derived import DerivedTracker
+from .filters import DeadbandFilter
+from .history import HistoryBuffer
+from .metrics import Metrics
+from .mqtt_transport import RECONNECT_MAX_DELAY, AsyncioMQTTClient, reconnect_delay
+from .sensor_definitions import DEFAULT_HEARTBEAT, VALUE_CONVERTERS
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR, Platform.SWITCH, Platform.NUMBER]
+PLATFORMS = [Platform.SENSOR, Platform.SWITCH, Platform.NUMBER, Platform.BINARY_SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+GET_HISTORY_SCHEMA = vol.Schema({
+    vol.Required(ATTR_KEYS): vol.All(cv.ensure_list_csv, [cv.string]),
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the Centrometal services."""
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return recorded MQTT samples of the requested keys, per boiler."""
+        coordinators = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id is not None:
+            if entry_id not in coordinators:
+                raise HomeAssistantError(f"Centrometal config entry {entry_id} is not loaded")
+            coordinators = {entry_id: coordinators[entry_id]}
+
+        end = dt_util.as_utc(call.data[ATTR_END]).timestamp() if ATTR_END in call.data else time.time()
+        response = {}
+        for coordinator in coordinators.values():
+            history = coordinator.history
+            if history is None:
+                continue
+            if ATTR_START in call.data:
+                start = dt_util.as_utc(call.data[ATTR_START]).timestamp()
+            else:
+                start = end - history.hours * 3600
+            response[coordinator.mqtt_client.device_id] = {
+                key: [
+                    [dt_util.utc_from_timestamp(timestamp).isoformat(), None if math.isnan(value) else value]
+                    for timestamp, value in samples
+                ]
+                for key, samples in history.query(call.data[ATTR_KEYS], start, end).items()
+            }
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -26,18 +143,59 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     install_id = entry.data.get("install_id", DEFAULT_INSTALL_ID)  # Default: 1844 (same for all)
     device_id = entry.data.get("device_id", "AD53C83A")  # Fallback for existing configs
 
-    # Create API instance
-    api = CentrometalAPI(email, password, install_id)
+    # Get the API client shared by all entries of this account
+    api = async_get_api(hass, email, password, install_id)
 
     # Create MQTT client and coordinator
-    mqtt_client = CentrometalMQTTClient(hass, install_id, device_id)
-    coordinator = CentrometalDataUpdateCoordinator(hass, api, mqtt_client)
+    transport = entry.options.get(CONF_MQTT_TRANSPORT, DEFAULT_MQTT_TRANSPORT)
+    track_commands = entry.options.get(CONF_TRACK_COMMANDS, False)
+    mqtt_client = CentrometalMQTTClient(hass, install_id, device_id, transport, track_commands)
+    cache = CentrometalStateCache(hass, entry.entry_id)
+    value_filter = DeadbandFilter.from_options(
+        entry.options.get(CONF_DEADBANDS, ""),
+        entry.options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT),
+    )
+    windows = parse_windows(entry.options.get(CONF_AGGREGATE_WINDOWS, ""))
+    aggregates = AggregateTracker(windows) if windows else None
+
+    # Recent MQTT samples for the get_history service
+    history = None
+    history_hours = entry.options.get(CONF_HISTORY_HOURS, DEFAULT_HISTORY_HOURS)
+    if history_hours:
+        path = _history_path(hass, entry) if entry.options.get(CONF_HISTORY_SPILL, False) else None
+        history = HistoryBuffer(history_hours, path)
+        await hass.async_add_executor_job(history.open)
+
+    stale_after = entry.options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER) * 60
+    coordinator = CentrometalDataUpdateCoordinator(
+        hass, api, mqtt_client, cache, value_filter, aggregates, history, stale_after
+    )
+
+    # Restore the cache before MQTT starts, so it never overwrites live values
+    cached = await cache.async_load()
+    if cache.derived:
+        coordinator.derived.restore(cache.derived)
+    if cached is not None:
+        data, age = cached
+        max_age = entry.options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE) * 60
+        coordinator.async_restore(data, stale=age > max_age)
 
     # Start MQTT client
-    await hass.async_add_executor_job(mqtt_client.start)
+    await mqtt_client.async_start()
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    if cached is not None:
+        # Create entities from the last known state, refresh from the network in the background
+        entry.async_create_background_task(hass, coordinator.async_refresh(), "centrometal initial refresh")
+    else:
+        # Fetch initial data
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await mqtt_client.async_stop()
+            await async_release_api(hass, api)
+            if history is not None:
+                await hass.async_add_executor_job(history.close)
+            raise
 
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
@@ -46,6 +204,40 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Reload when options change
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    # Poll the portal sooner when the MQTT stream goes quiet
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, coordinator.async_check_mqtt_freshness, timedelta(seconds=MQTT_FRESH_SECONDS)
+        )
+    )
+
+    if stale_after:
+        # Notice silent keys and a stalled MQTT stream
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, coordinator.async_check_watchdog, timedelta(seconds=WATCHDOG_INTERVAL)
+            )
+        )
+
+    if value_filter.deadbands and value_filter.heartbeat:
+        # Publish values held back by their deadband once the sensor settles
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, coordinator.async_flush_deadband, timedelta(seconds=DEADBAND_FLUSH_INTERVAL)
+            )
+        )
+
+    if aggregates is not None:
+        # Publish windows that ended while a channel was quiet
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, coordinator.async_roll_aggregates, timedelta(seconds=AGGREGATE_ROLL_INTERVAL)
+            )
+        )
+
     return True
 
 
@@ -55,47 +247,227 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Stop MQTT client
     if coordinator.mqtt_client:
-        await hass.async_add_executor_job(coordinator.mqtt_client.stop)
+        await coordinator.mqtt_client.async_stop()
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
+        await coordinator.async_shutdown()
+        await async_release_api(hass, coordinator.api)
+        if coordinator.history is not None:
+            await hass.async_add_executor_job(coordinator.history.close)
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
 
 
-class CentrometalMQTTClient:
-    """MQTT client for real-time boiler status updates."""
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached state and history of a deleted config entry."""
+    await CentrometalStateCache(hass, entry.entry_id).async_remove()
+    path = _history_path(hass, entry)
+    if await hass.async_add_executor_job(os.path.exists, path):
+        await hass.async_add_executor_job(os.remove, path)
 
-    def __init__(self, hass: HomeAssistant, install_id: str, device_id: str):
-        """Initialize MQTT client."""
+
+def _history_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the path of the memory-mapped sample history of an entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.history")
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload config entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+@callback
+def async_get_api(hass: HomeAssistant, email: str, password: str, install_id: str) -> CentrometalAPI:
+    """Return the portal client shared by all config entries of an account."""
+    clients = hass.data.setdefault(DATA_API_CLIENTS, {})
+    key = (email.lower(), install_id)
+    api = clients.get(key)
+    if api is None:
+        # Home Assistant's connection pool, with cookies kept per account
+        session = async_create_clientsession(hass, auto_cleanup=False, cookie_jar=aiohttp.CookieJar())
+        api = clients[key] = CentrometalAPI(email, password, install_id, session)
+    api.refcount += 1
+    return api
+
+
+async def async_release_api(hass: HomeAssistant, api: CentrometalAPI) -> None:
+    """Release a shared portal client, closing it after its last config entry."""
+    api.refcount -= 1
+    if api.refcount > 0:
+        return
+    clients = hass.data.get(DATA_API_CLIENTS, {})
+    key = (api.email.lower(), api.install_id)
+    if clients.get(key) is api:
+        clients.pop(key)
+    await api.close()
+
+
+def _values_match(actual, requested) -> bool:
+    """Return True if a reported value equals a requested one ("80", 80 and 80.0 match)."""
+    try:
+        return float(actual) == float(requested)
+    except (ValueError, TypeError):
+        return actual == requested
+
+
+class PendingWrite:
+    """Optimistic write awaiting confirmation by the boiler."""
+
+    __slots__ = ("requested", "previous", "command", "cancel", "sent", "echoed", "applied")
+
+    def __init__(self, requested, previous, command: dict, cancel: CALLBACK_TYPE, applied: asyncio.Future):
+        """Initialize the write."""
+        self.requested = requested
+        self.previous = previous
+        self.command = command
+        self.cancel = cancel
+
+        # time.monotonic() when the write was requested, and when the server
+        # published it to the boiler (only seen with track_commands)
+        self.sent = time.monotonic()
+        self.echoed = None
+
+        # Resolved with True once the boiler reports the value, False if it is rolled back
+        self.applied = applied
+
+    def finish(self, applied: bool) -> None:
+        """Cancel the rollback timer and wake callers waiting for the result."""
+        self.cancel()
+        if not self.applied.done():
+            self.applied.set_result(applied)
+
+
+class CentrometalMQTTHub:
+    """Single broker connection shared by all Centrometal config entries."""
+
+    def __init__(self, hass: HomeAssistant, transport: str):
+        """Initialize the hub."""
         self.hass = hass
-        self.install_id = install_id
-        self.device_id = device_id
+        self.transport = transport
         self.client = None
-        self.data = {}
-        self._connected = False
+        self.connected = False
 
-        # MQTT topics based on device ID
-        self.topic_device_status = f"cm/inst/biotec/{self.device_id}"
-        self.topic_server_commands = f"cm/srv/biotec/{self.device_id}"
+        # time.monotonic() of the last message for any device, for the stall watchdog
+        self.last_message = time.monotonic()
+
+        # Subscribed topic -> device client, a device may own several topics
+        self._clients: dict[str, "CentrometalMQTTClient"] = {}
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def refcount(self) -> int:
+        """Return the number of devices using the connection."""
+        return len(set(self._clients.values()))
+
+    async def async_register(self, mqtt_client: "CentrometalMQTTClient") -> None:
+        """Route the topics of a device to its client, connecting on first use."""
+        topics = mqtt_client.topics
+        async with self._lock:
+            for topic in topics:
+                self._clients[topic] = mqtt_client
+
+            if self.client is None:
+                await self._async_connect()
+            elif self.transport == MQTT_TRANSPORT_ASYNCIO:
+                for topic in topics:
+                    self.client.subscribe(topic)
+            elif self.connected:
+                for topic in topics:
+                    await self.hass.async_add_executor_job(self.client.subscribe, topic)
+
+        _LOGGER.debug("MQTT hub now routes %d topics of %d devices", len(self._clients), self.refcount)
+
+    async def async_unregister(self, mqtt_client: "CentrometalMQTTClient") -> None:
+        """Stop routing the topics of a device, disconnecting after the last one."""
+        async with self._lock:
+            topics = [topic for topic in mqtt_client.topics if self._clients.pop(topic, None) is not None]
+            if not topics:
+                return
+
+            if not self._clients:
+                await self._async_disconnect()
+            elif self.transport == MQTT_TRANSPORT_ASYNCIO:
+                for topic in topics:
+                    self.client.unsubscribe(topic)
+            elif self.connected:
+                for topic in topics:
+                    await self.hass.async_add_executor_job(self.client.unsubscribe, topic)
+
+    async def async_resubscribe(self, mqtt_client: "CentrometalMQTTClient") -> None:
+        """Subscribe to the topics of a device again, in case the broker dropped them."""
+        async with self._lock:
+            if self.client is None:
+                return
+            for topic in mqtt_client.topics:
+                if self.transport == MQTT_TRANSPORT_ASYNCIO:
+                    self.client.unsubscribe(topic)
+                    self.client.subscribe(topic)
+                elif self.connected:
+                    await self.hass.async_add_executor_job(self.client.unsubscribe, topic)
+                    await self.hass.async_add_executor_job(self.client.subscribe, topic)
+
+    async def async_reconnect(self) -> None:
+        """Drop the broker connection and connect again."""
+        async with self._lock:
+            if self.client is None:
+                return
+            self.last_message = time.monotonic()
+            if self.transport == MQTT_TRANSPORT_ASYNCIO:
+                self.client.reconnect()
+                return
+            await self.hass.async_add_executor_job(self.reconnect)
+
+    async def _async_connect(self) -> None:
+        """Open the shared broker connection."""
+        if self.transport != MQTT_TRANSPORT_ASYNCIO:
+            await self.hass.async_add_executor_job(self.start)
+            return
+
+        # Native transport: the broker socket is read on the event loop itself
+        self.client = AsyncioMQTTClient(MQTT_BROKER, MQTT_PORT, MQTT_USER, MQTT_PASS, 60)
+        self.client.on_connect = self._async_on_connect
+        self.client.on_message = self._async_on_message
+        self.client.on_disconnect = self._async_on_disconnect
+        for topic in self._clients:
+            self.client.subscribe(topic)
+        self._task = self.hass.async_create_background_task(
+            self.client.run(), "centrometal mqtt"
+        )
+
+    async def _async_disconnect(self) -> None:
+        """Close the shared broker connection."""
+        if self.transport != MQTT_TRANSPORT_ASYNCIO:
+            await self.hass.async_add_executor_job(self.stop)
+        else:
+            if self.client:
+                await self.client.stop()
+            if self._task:
+                self._task.cancel()
+                self._task = None
+            _LOGGER.info("MQTT client disconnected")
+        self.client = None
+        self.connected = False
 
     def start(self):
-        """Start MQTT client."""
+        """Start MQTT client, its network thread keeps trying until the broker answers."""
         try:
             # paho-mqtt 2.x requires callback API version
             self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1)
             self.client.username_pw_set(MQTT_USER, MQTT_PASS)
+            self.client.reconnect_delay_set(reconnect_delay(0), RECONNECT_MAX_DELAY)
             self.client.on_connect = self._on_connect
             self.client.on_message = self._on_message
             self.client.on_disconnect = self._on_disconnect
 
             _LOGGER.info("Connecting to MQTT broker %s:%s", MQTT_BROKER, MQTT_PORT)
-            self.client.connect(MQTT_BROKER, MQTT_PORT, 60)
+            self.client.connect_async(MQTT_BROKER, MQTT_PORT, 60)
             self.client.loop_start()
         except Exception as err:
-            _LOGGER.error("Failed to connect to MQTT broker: %s", err)
+            _LOGGER.error("Failed to start MQTT client: %s", err)
 
     def stop(self):
         """Stop MQTT client."""
@@ -104,40 +476,235 @@ class CentrometalMQTTClient:
             self.client.disconnect()
             _LOGGER.info("MQTT client disconnected")
 
+    def reconnect(self):
+        """Reconnect the paho client with its network thread stopped, paho is not thread-safe."""
+        self.client.loop_stop()
+        try:
+            self.client.reconnect()
+        except Exception as err:  # pylint: disable=broad-except
+            # The network loop keeps retrying once it runs again
+            _LOGGER.warning("MQTT reconnect failed: %s", err)
+        finally:
+            self.client.loop_start()
+
     def _on_connect(self, client, userdata, flags, rc):
         """Handle MQTT connection."""
         if rc == 0:
             _LOGGER.info("Connected to MQTT broker successfully")
-            self._connected = True
-            # Subscribe to device status topic
-            result = client.subscribe(self.topic_device_status)
-            _LOGGER.info("Subscribed to topic: %s (result: %s)", self.topic_device_status, result)
+            self.connected = True
+            # Clean session: subscribe to every registered device topic again
+            for topic in list(self._clients):
+                result = client.subscribe(topic)
+                _LOGGER.info("Subscribed to topic: %s (result: %s)", topic, result)
+            self._notify_connection()
         else:
             _LOGGER.error("Failed to connect to MQTT broker, return code %d", rc)
 
     def _on_disconnect(self, client, userdata, rc):
         """Handle MQTT disconnection."""
-        self._connected = False
+        self.connected = False
         if rc != 0:
+            # paho doubles the delay from here; a fresh random start spreads the
+            # clients of the shared broker instead of reconnecting all at once
+            client.reconnect_delay_set(reconnect_delay(0), RECONNECT_MAX_DELAY)
             _LOGGER.warning("Unexpected MQTT disconnection. Will auto-reconnect")
+        self._notify_connection()
 
     def _on_message(self, client, userdata, msg):
-        """Handle incoming MQTT messages."""
-        try:
-            payload = json.loads(msg.payload.decode())
-            _LOGGER.info("MQTT message received on %s with %d fields", msg.topic, len(payload))
-            _LOGGER.debug("MQTT payload: %s", payload)
+        """Route an incoming MQTT message to its device."""
+        self.last_message = time.monotonic()
+        mqtt_client = self._clients.get(msg.topic)
+        if mqtt_client is not None:
+            mqtt_client._on_message(msg.topic, msg.payload)
 
-            # Update data dictionary with new values
-            self.data.update(payload)
-            _LOGGER.debug("Total data fields after update: %d", len(self.data))
+    @callback
+    def _async_on_connect(self):
+        """Handle MQTT connection on the native transport."""
+        _LOGGER.info("Connected to MQTT broker successfully")
+        self.connected = True
+        self._notify_connection()
 
-            # Notify Home Assistant about data update
+    @callback
+    def _async_on_disconnect(self):
+        """Handle MQTT disconnection on the native transport."""
+        self.connected = False
+        _LOGGER.warning("Unexpected MQTT disconnection. Will auto-reconnect")
+        self._notify_connection()
+
+    def _notify_connection(self) -> None:
+        """Tell every device client that the connection went up or down (from any thread)."""
+        for mqtt_client in set(list(self._clients.values())):
+            self.hass.loop.call_soon_threadsafe(mqtt_client._notify_connection)
+
+    @callback
+    def _async_on_message(self, topic: str, raw: bytes):
+        """Route an incoming MQTT message to its device on the native transport."""
+        self.last_message = time.monotonic()
+        mqtt_client = self._clients.get(topic)
+        if mqtt_client is not None:
+            mqtt_client._async_on_message(topic, raw)
+
+
+async def async_get_mqtt_hub(hass: HomeAssistant, transport: str) -> CentrometalMQTTHub:
+    """Return the shared MQTT hub, creating it on first use."""
+    hub = hass.data.get(DATA_MQTT_HUB)
+    if hub is None:
+        hub = hass.data[DATA_MQTT_HUB] = CentrometalMQTTHub(hass, transport)
+    elif hub.transport != transport:
+        _LOGGER.warning(
+            "MQTT transport %s requested, but the shared connection already uses %s",
+            transport,
+            hub.transport,
+        )
+    return hub
+
+
+class CentrometalMQTTClient:
+    """MQTT client for real-time boiler status updates."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        install_id: str,
+        device_id: str,
+        transport: str = DEFAULT_MQTT_TRANSPORT,
+        track_commands: bool = False,
+    ):
+        """Initialize MQTT client."""
+        self.hass = hass
+        self.install_id = install_id
+        self.device_id = device_id
+        self.transport = transport
+        self.hub = None
+
+        # Also follow the commands the server publishes to the boiler
+        self.track_commands = track_commands
+
+        # Payload decoder, bytes in and dict out
+        self.decode = decode_payload
+
+        # Ingest and command metrics of this boiler, see diagnostics.py
+        self.metrics = Metrics()
+
+        # Handoff from the ingest side (paho thread or event loop): decoded
+        # payloads are appended to the inbox with their receive time, the loop
+        # drains whole batches into the coordinator data. deque.append/popleft
+        # are atomic, so neither side takes a lock or copies the parameter map.
+        self._inbox = deque()
+        self._drain_scheduled = False
+
+        # Receive time (time.monotonic()) of the oldest payload in the last drained batch
+        self.drained_received = None
+
+        # MQTT topics based on device ID
+        self.topic_device_status = f"cm/inst/biotec/{self.device_id}"
+        self.topic_server_commands = f"cm/srv/biotec/{self.device_id}"
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the shared broker connection is up."""
+        return self.hub is not None and self.hub.connected
+
+    @property
+    def topics(self) -> tuple[str, ...]:
+        """Return the topics of this device to subscribe to."""
+        if self.track_commands:
+            return (self.topic_device_status, self.topic_server_commands)
+        return (self.topic_device_status,)
+
+    async def async_start(self):
+        """Attach to the shared broker connection."""
+        self.hub = await async_get_mqtt_hub(self.hass, self.transport)
+        await self.hub.async_register(self)
+
+    async def async_stop(self):
+        """Detach from the shared broker connection."""
+        if self.hub is None:
+            return
+        await self.hub.async_unregister(self)
+        if not self.hub.refcount and self.hass.data.get(DATA_MQTT_HUB) is self.hub:
+            self.hass.data.pop(DATA_MQTT_HUB)
+        self.hub = None
+
+    def _on_message(self, topic: str, raw: bytes):
+        """Handle incoming MQTT messages on the paho thread."""
+        if topic == self.topic_server_commands:
+            # Rare, decoded on the event loop
+            self.hass.loop.call_soon_threadsafe(self._async_on_command, time.monotonic(), raw)
+            return
+        if self._process_message(topic, raw) and not self._drain_scheduled:
+            # Notify Home Assistant about data update, once per batch
+            self._drain_scheduled = True
             self.hass.loop.call_soon_threadsafe(self._notify_update)
+
+    @callback
+    def _async_on_message(self, topic: str, raw: bytes):
+        """Handle incoming MQTT messages on the event loop."""
+        if topic == self.topic_server_commands:
+            self._async_on_command(time.monotonic(), raw)
+            return
+        if self._process_message(topic, raw):
+            self._notify_update()
+
+    @callback
+    def _async_on_command(self, received: float, raw: bytes):
+        """Hand a command the server published to the boiler over to the coordinator."""
+        try:
+            payload = self.decode(raw)
+        except ValueError as err:
+            _LOGGER.debug("Ignoring undecodable command on %s: %s", self.topic_server_commands, err)
+            return
+        if isinstance(payload, dict):
+            self.metrics.increment("command_echoes")
+            self._notify_command(received, payload)
+
+    @callback
+    def async_drain(self) -> dict:
+        """Take every payload published since the last drain, merged into one delta."""
+        # Clear the flag before draining so a payload published meanwhile
+        # either makes it into this batch or schedules the next one
+        self._drain_scheduled = False
+        inbox = self._inbox
+        if not inbox:
+            return {}
+
+        # Payloads are private to the inbox, merge into the oldest one in place
+        self.drained_received, delta = inbox.popleft()
+        while inbox:
+            delta.update(inbox.popleft()[1])
+        return delta
+
+    def _process_message(self, topic: str, raw: bytes) -> bool:
+        """Decode a message and queue it for the event loop."""
+        try:
+            received = time.monotonic()
+            metrics = self.metrics
+            metrics.increment("mqtt_messages")
+            metrics.increment("mqtt_bytes", len(raw))
+            payload = self.decode(raw)
+            metrics.observe("mqtt_decode", time.monotonic() - received)
+            if not isinstance(payload, dict):
+                _LOGGER.warning("Ignoring MQTT message on %s that is not a JSON object", topic)
+                return False
+
+            # Log a sample instead of every message
+            count = metrics.counters["mqtt_messages"]
+            if count % MQTT_LOG_SAMPLE == 1 and _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "MQTT message %d received on %s with %d fields: %s",
+                    count, topic, len(payload), payload,
+                )
+
+            # Hand the payload over to the event loop
+            self._inbox.append((received, payload))
+            return True
         except json.JSONDecodeError as err:
-            _LOGGER.error("Failed to decode MQTT message: %s (payload: %s)", err, msg.payload)
+            self.metrics.failure("mqtt", "decode")
+            _LOGGER.error("Failed to decode MQTT message: %s (payload: %s)", err, raw)
         except Exception as err:
+            self.metrics.failure("mqtt", type(err).__name__)
             _LOGGER.error("Error processing MQTT message: %s", err, exc_info=True)
+        return False
 
     def _notify_update(self):
         """Notify coordinator about data update."""
@@ -145,55 +712,572 @@ class CentrometalMQTTClient:
         # The coordinator will handle updating entities
         pass
 
+    def _notify_command(self, received: float, payload: dict):
+        """Notify coordinator about a command sent to the boiler."""
+        pass
+
+    def _notify_connection(self):
+        """Notify coordinator about the broker connection going up or down."""
+        pass
+
 
 class CentrometalDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Centrometal data."""
 
-    def __init__(self, hass: HomeAssistant, api: CentrometalAPI, mqtt_client: CentrometalMQTTClient):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: CentrometalAPI,
+        mqtt_client: CentrometalMQTTClient,
+        cache: CentrometalStateCache,
+        value_filter: DeadbandFilter | None = None,
+        aggregates: AggregateTracker | None = None,
+        history: HistoryBuffer | None = None,
+        stale_after: float = 0,
+    ):
         """Initialize."""
         self.api = api
         self.mqtt_client = mqtt_client
+        self.cache = cache
+
+        # Holds back MQTT jitter before it reaches the entities, None publishes every change
+        self.value_filter = value_filter
+
+        # Windowed min/max/mean of the fast channels, None when disabled
+        self.aggregates = aggregates
+
+        # Recent raw MQTT samples per key, None when disabled
+        self.history = history
+
+        # Ingest and command metrics, shared with the MQTT client that records the ingest side
+        self.metrics = mqtt_client.metrics
+
+        # Energy, pellet and burner statistics from the counters, persisted with the cache
+        self.derived = DerivedTracker()
+        cache.derived_func = self.derived.as_dict
+
+        # True while data comes from a cache older than the configured max age
+        self.stale = False
+
+        # Watchdog: time.monotonic() each MQTT key was last received, and the
+        # keys silent for longer than stale_after seconds (0 disables it)
+        self.stale_after = stale_after
+        self.last_seen: dict[str, float] = {}
+        self.stale_keys: set[str] = set()
+        self._watchdog_since = time.monotonic()
+        self._watchdog_refresh: float | None = None
+        self._stall_action: float | None = None
+
+        # Sensor values decoded once at ingest, keyed like data
+        self.values: dict = {}
+        self._key_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._new_keys_listeners: list = []
+
+        # Adaptive polling state (time.monotonic() timestamps)
+        self._last_mqtt_update: float | None = None
+        self._last_write: float | None = None
+        self._pval_changed_at: dict[str, float] = {}
+
+        # Change number of the portal PVAL values this coordinator has merged
+        self._pval_since = 0
+
+        # True when the last portal poll changed nothing, entities then skip their state write
+        self.unchanged = False
+
+        # Set while a follow-up refresh for a batch of commands is scheduled
+        self._followup_refresh = None
+
+        # Optimistic writes awaiting confirmation, by data key
+        self._pending_writes: dict[str, PendingWrite] = {}
 
         # Link coordinator to MQTT client for updates
         mqtt_client._notify_update = self._handle_mqtt_update
+        mqtt_client._notify_command = self._async_handle_command_echo
+        mqtt_client._notify_connection = self._async_connection_changed
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=60),  # Less frequent polling since we have MQTT
+            update_interval=timedelta(seconds=POLL_INTERVAL_MIN),  # Stretched while MQTT is fresh
+        )
+
+    @callback
+    def async_restore(self, data: dict, stale: bool) -> None:
+        """Seed the coordinator with cached data before the first refresh."""
+        self.data = data
+        self.stale = stale
+        self._async_update_values(data, data)
+        _LOGGER.info("Restored %d cached keys%s", len(data), " (stale)" if stale else "")
+
+    @callback
+    def _async_update_values(self, data: dict, keys) -> None:
+        """Decode the given keys of data into sensor values."""
+        values = self.values
+        for key in keys:
+            converter = VALUE_CONVERTERS.get(key)
+            if converter is not None:
+                value = data.get(key)
+                values[key] = None if value is None else converter(value)
+
+    @callback
+    def _async_mark_fresh(self) -> None:
+        """Trust the data again once live values arrive."""
+        if self.stale:
+            self.stale = False
+            self.unchanged = False
+            self.async_update_listeners()
+
+    @callback
+    def _async_save_cache(self) -> None:
+        """Persist the current data (debounced)."""
+        self.cache.async_schedule_save(self._async_cache_data)
+
+    @callback
+    def _async_cache_data(self) -> dict | None:
+        """Return the data to persist, with unconfirmed writes replaced by their last confirmed value."""
+        if not self._pending_writes or self.data is None:
+            return self.data
+        data = dict(self.data)
+        for state_key, pending in self._pending_writes.items():
+            if pending.previous is None:
+                data.pop(state_key, None)
+            else:
+                data[state_key] = pending.previous
+        return data
+
+    @property
+    def mqtt_fresh(self) -> bool:
+        """Return True if MQTT data arrived recently."""
+        return (
+            self._last_mqtt_update is not None
+            and time.monotonic() - self._last_mqtt_update < MQTT_FRESH_SECONDS
         )
 
+    @callback
+    def async_note_write(self) -> None:
+        """Record a write so the next polls pick up the new PVAL values quickly."""
+        self._last_write = time.monotonic()
+        self._set_poll_interval(POLL_INTERVAL_MIN)
+
+    async def async_send_command(self, command: dict) -> bool:
+        """Queue a command and refresh once after the batch it joined."""
+        self.async_note_write()
+        success = await self.api.queue_command(command)
+        if success and self._followup_refresh is None:
+            # All callers of a batch resume together, so only the first one schedules it
+            self._followup_refresh = self.hass.async_create_task(self._async_followup_refresh())
+        return success
+
+    async def async_shutdown(self) -> None:
+        """Persist the last known state and cancel pending timers."""
+        # Saved first, so unconfirmed writes are stored as their last confirmed value
+        await self.cache.async_save_now()
+        for pending in self._pending_writes.values():
+            pending.finish(False)
+        self._pending_writes.clear()
+        await super().async_shutdown()
+
+    async def async_write_value(self, state_key: str, command: dict, value, wait_applied: bool = False) -> bool:
+        """Send a command and show its value right away until it is confirmed.
+
+        Returns once the portal accepted the command or, with wait_applied, once
+        the boiler reports the value (False if it is rolled back instead).
+        """
+        pending = self._async_set_optimistic(state_key, command, value)
+        success = await self.async_send_command(command)
+        if not success:
+            self.metrics.increment("command_failures")
+            self._async_rollback(state_key, pending)
+            return False
+        self.metrics.observe("command_portal", time.monotonic() - pending.sent)
+        if wait_applied:
+            return await asyncio.shield(pending.applied)
+        return True
+
+    @callback
+    def _async_set_optimistic(self, state_key: str, command: dict, value) -> PendingWrite:
+        """Show a requested value and remember what to roll back to."""
+        if self.data is None:
+            self.data = {}
+        pending = self._pending_writes.get(state_key)
+        if pending:
+            # Superseded write, keep the last confirmed value for rollback
+            pending.finish(False)
+            previous = pending.previous
+        else:
+            previous = self.data.get(state_key)
+
+        if previous is not None and _values_match(previous, value):
+            # Already the reported value, the portal's change list will never confirm it
+            _LOGGER.debug("%s = %s confirmed, the value is unchanged", state_key, value)
+            pending = PendingWrite(value, previous, command, lambda: None, self.hass.loop.create_future())
+            pending.finish(True)
+        else:
+            cancel = async_call_later(self.hass, OPTIMISTIC_TIMEOUT, partial(self._async_write_timeout, state_key))
+            pending = PendingWrite(value, previous, command, cancel, self.hass.loop.create_future())
+            self._pending_writes[state_key] = pending
+        self.data[state_key] = value
+        self._async_update_values(self.data, (state_key,))
+        self._async_dispatch((state_key,))
+        return pending
+
+    @callback
+    def _async_write_timeout(self, state_key: str, _now) -> None:
+        """Roll back a write that was never confirmed."""
+        pending = self._pending_writes.get(state_key)
+        if pending:
+            # The timer fired, so there is nothing left to cancel
+            pending.cancel = lambda: None
+            self.metrics.increment("command_timeouts")
+            _LOGGER.warning(
+                "%s = %s was not confirmed within %d s, rolling back", state_key, pending.requested, OPTIMISTIC_TIMEOUT
+            )
+            self._async_rollback(state_key, pending)
+
+    @callback
+    def _async_rollback(self, state_key: str, pending: PendingWrite) -> None:
+        """Restore the last confirmed value of a pending write, unless a newer write replaced it."""
+        pending.finish(False)
+        if self._pending_writes.get(state_key) is not pending:
+            return
+        del self._pending_writes[state_key]
+        if pending.previous is None:
+            self.data.pop(state_key, None)
+        else:
+            self.data[state_key] = pending.previous
+        self._async_update_values(self.data, (state_key,))
+        self._async_dispatch((state_key,))
+
+    @callback
+    def _async_reconcile_pending(self, incoming: dict, source: str) -> None:
+        """Confirm pending writes from incoming data (mqtt or portal), masking values still in flight."""
+        for state_key in self._pending_writes.keys() & incoming.keys():
+            pending = self._pending_writes[state_key]
+            if _values_match(incoming[state_key], pending.requested):
+                _LOGGER.debug("%s = %s confirmed", state_key, pending.requested)
+                now = time.monotonic()
+                self.metrics.observe(f"command_confirm_{source}", now - pending.sent)
+                if source == "mqtt" and pending.echoed is not None:
+                    # Hop from the server topic to the boiler's own report
+                    self.metrics.observe("command_boiler", now - pending.echoed)
+                pending.finish(True)
+                del self._pending_writes[state_key]
+            else:
+                # Not applied yet, remember it as the value to roll back to
+                pending.previous = incoming[state_key]
+                incoming[state_key] = pending.requested
+
+    @callback
+    def _async_handle_command_echo(self, received: float, payload: dict) -> None:
+        """Note when the server published a pending write to the boiler."""
+        for state_key, pending in self._pending_writes.items():
+            if pending.echoed is None and all(
+                key in payload and _values_match(payload[key], value) for key, value in pending.command.items()
+            ):
+                _LOGGER.debug("%s = %s published to the boiler", state_key, pending.requested)
+                pending.echoed = received
+                self.metrics.observe("command_broker", received - pending.sent)
+
+    async def _async_followup_refresh(self) -> None:
+        """Refresh after a batch of commands."""
+        try:
+            await self.async_request_refresh()
+        finally:
+            self._followup_refresh = None
+
+    async def async_check_mqtt_freshness(self, now=None) -> None:
+        """Fall back to fast portal polling when MQTT goes stale."""
+        if self.mqtt_fresh or self.update_interval.total_seconds() <= POLL_INTERVAL_MIN:
+            return
+        _LOGGER.info("MQTT data is stale, polling portal every %d s", POLL_INTERVAL_MIN)
+        self._set_poll_interval(POLL_INTERVAL_MIN)
+        await self.async_request_refresh()
+
+    @callback
+    def _adapt_poll_interval(self) -> None:
+        """Stretch the portal interval while MQTT is healthy and PVALs are quiet."""
+        now = time.monotonic()
+        interval = self.update_interval.total_seconds()
+        if not self.mqtt_fresh or (self._last_write is not None and now - self._last_write < POLL_INTERVAL_MAX):
+            interval = POLL_INTERVAL_MIN
+        elif not any(now - changed < interval for changed in self._pval_changed_at.values()):
+            interval = min(interval * 2, POLL_INTERVAL_MAX)
+        self._set_poll_interval(interval)
+
+    @callback
+    def _set_poll_interval(self, seconds: float) -> None:
+        """Change the portal polling interval."""
+        if self.update_interval.total_seconds() != seconds:
+            _LOGGER.debug("Portal polling interval set to %d s", seconds)
+            self.update_interval = timedelta(seconds=seconds)
+
+    @callback
+    def async_add_key_listener(self, key: str, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for MQTT changes of a single data key."""
+        self._key_listeners.setdefault(key, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the key listener."""
+            listeners = self._key_listeners.get(key)
+            if listeners and update_callback in listeners:
+                listeners.remove(update_callback)
+                if not listeners:
+                    del self._key_listeners[key]
+
+        return remove_listener
+
+    @callback
+    def async_add_new_keys_listener(self, new_keys_callback) -> CALLBACK_TYPE:
+        """Listen for data keys appearing for the first time."""
+        self._new_keys_listeners.append(new_keys_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the new keys listener."""
+            if new_keys_callback in self._new_keys_listeners:
+                self._new_keys_listeners.remove(new_keys_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify_new_keys(self, keys) -> None:
+        """Tell platforms about keys seen for the first time."""
+        if not keys:
+            return
+        _LOGGER.debug("First appearance of %d keys: %s", len(keys), sorted(keys))
+        for new_keys_callback in list(self._new_keys_listeners):
+            new_keys_callback(keys)
+
+    @callback
     def _handle_mqtt_update(self):
         """Handle MQTT data update."""
-        # Merge MQTT data with existing coordinator data (preserves PVAL values)
-        combined_data = dict(self.data) if self.data else {}
-        combined_data.update(self.mqtt_client.data)
-        self.async_set_updated_data(combined_data)
+        payload = self.mqtt_client.async_drain()
+        if not payload:
+            return
+
+        self._last_mqtt_update = time.monotonic()
+        self.last_seen.update(dict.fromkeys(payload, self._last_mqtt_update))
+        if self.stale_keys:
+            self._async_mark_seen(payload)
+        if self.data is None:
+            # Nothing to diff against yet, do a full update
+            if self.value_filter is not None:
+                for key, value in payload.items():
+                    self.value_filter.accept(key, value, self._last_mqtt_update)
+            if self.aggregates is not None:
+                for key, value in payload.items():
+                    self.aggregates.add(key, value)
+            if self.history is not None:
+                for key, value in payload.items():
+                    self.history.add(key, value)
+            self.derived.update(payload, time.time())
+            self._async_update_values(payload, payload)
+            self.unchanged = False
+            self.async_set_updated_data(dict(payload))
+            self._async_notify_new_keys(set(payload))
+            self._observe_ingest()
+            return
+
+        if self._pending_writes:
+            payload = dict(payload)
+            self._async_reconcile_pending(payload, "mqtt")
+
+        # Merge only the keys whose value actually changed (preserves PVAL values)
+        data = self.data
+        changed = [key for key, value in payload.items() if key not in data or data[key] != value]
+        if not changed:
+            return
+
+        new_keys = {key for key in changed if key not in data}
+        for key in changed:
+            data[key] = payload[key]
+        self._async_save_cache()
+
+        # Aggregates, history and derived values see every raw sample, before the deadband
+        companions = []
+        if self.aggregates is not None:
+            for key in changed:
+                companions.extend(self.aggregates.add(key, data[key]))
+        now = time.time()
+        if self.history is not None:
+            for key in changed:
+                self.history.add(key, data[key], now)
+        companions.extend(self.derived.update(data, now))
+
+        # Publish only changes that leave their sensor's deadband
+        value_filter = self.value_filter
+        if value_filter is not None:
+            now = self._last_mqtt_update
+            changed = [key for key in changed if value_filter.accept(key, data[key], now)]
+        self._async_update_values(data, changed)
+
+        self._async_notify_new_keys(new_keys)
+        if self.stale:
+            self._async_mark_fresh()
+            return
+        self._async_dispatch(changed + companions if companions else changed)
+        self._observe_ingest()
+
+    @callback
+    def _observe_ingest(self) -> None:
+        """Record the time from receiving the oldest drained payload to its state writes."""
+        received = self.mqtt_client.drained_received
+        if received is not None:
+            self.metrics.observe("mqtt_ingest", time.monotonic() - received)
+
+    @callback
+    def _async_connection_changed(self) -> None:
+        """Count connection changes and update the entities showing the connection."""
+        self.metrics.increment("mqtt_connects" if self.mqtt_client.connected else "mqtt_disconnects")
+        self._async_dispatch((CONNECTION_KEY,))
+
+    @callback
+    def _async_mark_seen(self, payload: dict) -> None:
+        """Make keys the watchdog marked stale available again."""
+        recovered = self.stale_keys.intersection(payload)
+        if recovered:
+            self.stale_keys -= recovered
+            _LOGGER.info("%d stale keys are updated again", len(recovered))
+            self._async_dispatch(recovered)
+
+    async def async_check_watchdog(self, now=None) -> None:
+        """Mark keys without MQTT updates stale and recover a stalled stream."""
+        mono = time.monotonic()
+        limit = mono - self.stale_after
+
+        silent = [key for key, seen in self.last_seen.items() if seen < limit and key not in self.stale_keys]
+        if silent:
+            if self._watchdog_refresh is None or self._watchdog_refresh < limit:
+                # Values the boiler only sends on change come back with a refresh
+                self._watchdog_refresh = mono
+                self.metrics.increment("watchdog_refreshes")
+                await self.api.refresh_status()
+            elif mono - self._watchdog_refresh >= WATCHDOG_REFRESH_GRACE:
+                _LOGGER.warning(
+                    "No MQTT update of %d keys for %d min, marking them unavailable",
+                    len(silent), self.stale_after / 60,
+                )
+                self.stale_keys.update(silent)
+                self._async_dispatch(silent)
+
+        # A silent stream: resubscribe first, reconnect if the whole connection is silent
+        last_update = self._last_mqtt_update if self._last_mqtt_update is not None else self._watchdog_since
+        if last_update >= limit:
+            self._stall_action = None
+            return
+        if self._stall_action is not None and self._stall_action >= limit:
+            # Give the last recovery time to work
+            return
+        hub = self.mqtt_client.hub
+        if hub is None:
+            return
+        self._stall_action = mono
+        if hub.last_message < limit:
+            _LOGGER.warning("No MQTT message for %d min, reconnecting to the broker", self.stale_after / 60)
+            self.metrics.increment("watchdog_reconnects")
+            await hub.async_reconnect()
+        else:
+            _LOGGER.warning(
+                "No MQTT message from %s for %d min, subscribing again", self.mqtt_client.device_id, self.stale_after / 60
+            )
+            self.metrics.increment("watchdog_resubscribes")
+            await hub.async_resubscribe(self.mqtt_client)
+
+    @callback
+    def async_flush_deadband(self, now=None) -> None:
+        """Publish values held back by the deadband once their heartbeat is due."""
+        due = self.value_filter.flush(time.monotonic())
+        if due and self.data is not None:
+            self._async_update_values(self.data, due)
+            self._async_dispatch(due)
+
+    @callback
+    def async_roll_aggregates(self, now=None) -> None:
+        """Publish aggregate windows that ended without a new sample."""
+        closed = self.aggregates.roll()
+        if closed:
+            self._async_dispatch(closed)
+
+    @callback
+    def _async_dispatch(self, keys) -> None:
+        """Wake each entity subscribed to the keys once, even if several of its keys changed."""
+        callbacks = {}
+        for key in keys:
+            for update_callback in self._key_listeners.get(key, ()):
+                callbacks[update_callback] = None
+
+        _LOGGER.debug("%d keys changed, notifying %d entities", len(keys), len(callbacks))
+        for update_callback in callbacks:
+            update_callback()
 
     async def _async_update_data(self):
         """Fetch data from API."""
+        self.unchanged = False
+        if not self.api.breaker.available:
+            # Fail fast while the portal is down, MQTT keeps the data current
+            _LOGGER.debug("Portal circuit breaker is open, skipping the poll")
+            self.unchanged = self.data is not None
+            return self.data if self.data is not None else {}
+
         try:
-            # Request status refresh via API
-            await self.api.send_command({"REFRESH": 0})
+            # Request status refresh via API, the portal only updates PVALs after one
+            await self.api.refresh_status()
 
-            # Get PVAL parameters from portal (for number controls)
-            pval_data = await self.api.get_installation_status()
+            # Get the PVAL parameters (for number controls) changed since the last poll
+            changes = await self.api.get_installation_changes(self._pval_since)
+            pval_data = {}
+            if changes is not None:
+                pval_data, self._pval_since = changes
 
-            # Merge MQTT data with PVAL data
-            combined_data = {}
-            if self.mqtt_client.data:
-                combined_data.update(self.mqtt_client.data)
+            # Confirm or mask values of optimistic writes still in flight
+            if pval_data and self._pending_writes:
+                pval_data = dict(pval_data)
+                self._async_reconcile_pending(pval_data, "portal")
+
+            # Remember when each PVAL last changed
+            now = time.monotonic()
+            previous = self.data or {}
+            for key, value in pval_data.items():
+                if previous.get(key) != value:
+                    self._pval_changed_at[key] = now
+            if changes is None:
+                # The API logs and swallows its errors, poll again soon
+                self._set_poll_interval(POLL_INTERVAL_MIN)
+            else:
+                self._adapt_poll_interval()
+
+            was_stale = self.stale
+            if changes is not None or self.mqtt_fresh:
+                self.stale = False
+
+            if self.data is not None and not was_stale and not any(
+                previous.get(key) != value for key, value in pval_data.items()
+            ):
+                # Nothing moved, keep the data and the entity states as they are
+                self.unchanged = True
+                return self.data
+
+            # Coordinator data already holds every MQTT delta, add PVAL data on a copy
+            combined_data = dict(self.data) if self.data else {}
 
             # Add/update PVAL values from portal
             if pval_data:
                 combined_data.update(pval_data)
-                _LOGGER.debug("Combined MQTT data (%d keys) with PVAL data (%d keys)",
-                             len(self.mqtt_client.data), len(pval_data))
+                _LOGGER.debug("Combined MQTT data (%d keys) with %d changed PVAL values",
+                             len(self.data or {}), len(pval_data))
+
+            # Decode only what changed since the last update
+            self._async_update_values(combined_data, pval_data if self.data else combined_data)
+            self._async_save_cache()
+            self._async_notify_new_keys(combined_data.keys() - (self.data or {}).keys())
 
             return combined_data if combined_data else {}
 
         except Exception as err:
             _LOGGER.warning("Error communicating with API: %s", err)
-            # Even if API fails, return MQTT data if available
-            return self.mqtt_client.data if self.mqtt_client.data else {}
+            self._set_poll_interval(POLL_INTERVAL_MIN)
+            # Even if API fails, keep the last known values (MQTT keeps them current)
+            self.unchanged = self.data is not None
+            return self.data if self.data is not None else {}
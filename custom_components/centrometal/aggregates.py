@@ -0,0 +1,139 @@
+"""Windowed min/max/mean aggregates for fast Centrometal channels."""
+import time
+
+from .sensor_definitions import AGGREGATE_KEYS, VALUE_CONVERTERS
+
+# Statistics published per window, in the order of WindowAggregate.result
+AGGREGATE_STATS = ("min", "max", "mean")
+
+
+def parse_windows(text: str) -> list[int]:
+    """Parse window lengths in minutes written as "1, 5".
+
+    Raises ValueError if an entry can't be parsed.
+    """
+    windows = set()
+    for item in text.replace(";", ",").split(","):
+        if not item.strip():
+            continue
+        minutes = int(item)
+        if minutes <= 0:
+            raise ValueError(f"window must be at least one minute, got {minutes}")
+        windows.add(minutes)
+    return sorted(windows)
+
+
+def aggregate_key(key: str, minutes: int) -> str:
+    """Return the data key companion sensors of a window listen to."""
+    return f"{key}_{minutes}m"
+
+
+class WindowAggregate:
+    """Time-weighted min, max and mean of one channel over consecutive windows.
+
+    Windows are aligned to the wall clock (a 5 minute window closes at :00,
+    :05, ...). The boiler only reports changes, so a value counts until the
+    next one arrives. Every sample is O(1).
+    """
+
+    __slots__ = ("window", "result", "_start", "_since", "_min", "_max", "_integral", "_value", "_time")
+
+    def __init__(self, window: float):
+        """Initialize the aggregate for windows of the given length in seconds."""
+        self.window = window
+
+        # (min, max, mean) of the last completed window
+        self.result = None
+
+        # Current window start, and when its data begins (later for the first window)
+        self._start = 0.0
+        self._since = 0.0
+        self._min = self._max = None
+        self._integral = 0.0
+
+        # Last sample and when it arrived
+        self._value = None
+        self._time = 0.0
+
+    def add(self, value: float, now: float) -> bool:
+        """Add a sample; return True if a window closed."""
+        closed = self.roll(now)
+        if self._value is None:
+            self._start = now - now % self.window
+            self._since = now
+        else:
+            self._integral += self._value * (now - self._time)
+        self._value, self._time = value, now
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+        return closed
+
+    def roll(self, now: float) -> bool:
+        """Close the current window if it has ended; return True if it did."""
+        end = self._start + self.window
+        if self._value is None or now < end:
+            return False
+
+        self._integral += self._value * (end - self._time)
+        covered = end - self._since
+        self.result = (self._min, self._max, self._integral / covered if covered > 0 else self._value)
+
+        skipped = (now - end) // self.window
+        if skipped:
+            # Whole windows without samples held the last value throughout
+            self.result = (self._value, self._value, self._value)
+
+        self._start = self._since = self._time = end + skipped * self.window
+        self._min = self._max = self._value
+        self._integral = 0.0
+        return True
+
+
+class AggregateTracker:
+    """Window aggregates of the fast channels of one boiler."""
+
+    def __init__(self, windows: list[int]):
+        """Initialize aggregates for window lengths in minutes."""
+        self.windows = windows
+        self._aggregates = {
+            key: {minutes: WindowAggregate(minutes * 60) for minutes in windows}
+            for key in AGGREGATE_KEYS
+        }
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if key is aggregated."""
+        return key in self._aggregates
+
+    def add(self, key: str, raw) -> list[str]:
+        """Add a raw value of key; return the aggregate keys whose window closed."""
+        aggregates = self._aggregates.get(key)
+        if aggregates is None:
+            return []
+        try:
+            value = float(VALUE_CONVERTERS[key](raw))
+        except (ValueError, TypeError):
+            # Disconnected sensor or garbage, leave the windows alone
+            return []
+
+        now = time.time()
+        return [
+            aggregate_key(key, minutes)
+            for minutes, aggregate in aggregates.items()
+            if aggregate.add(value, now)
+        ]
+
+    def roll(self) -> list[str]:
+        """Close every window that has ended; return the aggregate keys that closed."""
+        now = time.time()
+        return [
+            aggregate_key(key, minutes)
+            for key, aggregates in self._aggregates.items()
+            for minutes, aggregate in aggregates.items()
+            if aggregate.roll(now)
+        ]
+
+    def result(self, key: str, minutes: int):
+        """Return (min, max, mean) of the last completed window, or None."""
+        return self._aggregates[key][minutes].result
@@ -1,25 +1,84 @@
 """API client for Centrometal portal."""
+import asyncio
 import logging
 import re
+import time
 import aiohttp
 import async_timeout
 
-from .const import LOGIN_PAGE, LOGIN_POST, API_CONTROL, API_STATUS
+from .breaker import CircuitBreaker, PortalUnavailableError
+from .const import (
+    LOGIN_PAGE,
+    LOGIN_POST,
+    API_CONTROL,
+    API_STATUS,
+    COMMAND_BATCH_WINDOW,
+    PORTAL_TIMEOUTS,
+    STATUS_SHARE_WINDOW,
+)
+from .metrics import Metrics
 
 _LOGGER = logging.getLogger(__name__)
 
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class PortalAuthError(Exception):
+    """Raised when the portal no longer accepts the session."""
+
 
 class CentrometalAPI:
     """Centrometal Portal API client."""
 
-    def __init__(self, email: str, password: str, install_id: str):
-        """Initialize the API client."""
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        install_id: str,
+        session: aiohttp.ClientSession | None = None,
+    ):
+        """Initialize the API client.
+
+        Pass a session (with its own cookie jar) to share a connection pool;
+        without one the client creates and owns a private session.
+        """
         self.email = email
         self.password = password
         self.install_id = install_id
-        self._session = None
+        self._session = session
+        self._owns_session = session is None
         self._logged_in = False
 
+        # Bumped on every successful login, so callers that saw an expired
+        # session can tell whether someone else already logged in again
+        self._login_generation = 0
+        self._login_task = None
+
+        # Config entries using this client, see async_get_api
+        self.refcount = 0
+
+        # Logins, request latency per endpoint and failure reasons
+        self.metrics = Metrics()
+
+        # Fails requests fast while the portal is down and caps the request rate
+        self.breaker = CircuitBreaker()
+
+        # Last installation status and the fetch in flight, shared by all callers
+        self._status_time = 0.0
+        self._status_task = None
+
+        # Parsed PVAL values with the portal's update time ("ut") of each, and
+        # the change number at which each value last changed
+        self._pvals: dict = {}
+        self._pval_ut: dict = {}
+        self._pval_changed: dict[str, int] = {}
+        self._pval_counter = 0
+
+        # Commands waiting to be sent together in one control/multiple POST
+        self._pending_commands: dict = {}
+        self._pending_futures: list[asyncio.Future] = []
+        self._flush_task = None
+
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
         if self._session is None:
@@ -32,13 +91,15 @@ class CentrometalAPI:
             session = await self._get_session()
 
             # Get CSRF token
-            async with async_timeout.timeout(10):
+            async with async_timeout.timeout(PORTAL_TIMEOUTS["login"]):
                 async with session.get(LOGIN_PAGE) as resp:
                     text = await resp.text()
 
             match = re.search(r'name="_csrf_token"\s+value="([^"]+)"', text)
             if not match:
                 _LOGGER.error("Could not find CSRF token")
+                self.metrics.failure("login", "no_csrf_token")
+                self.breaker.record_success()
                 return False
 
             csrf_token = match.group(1)
@@ -50,33 +111,137 @@ class CentrometalAPI:
                 "_password": self.password,
             }
 
-            async with async_timeout.timeout(10):
+            async with async_timeout.timeout(PORTAL_TIMEOUTS["login"]):
                 async with session.post(
                     LOGIN_POST,
                     data=login_data,
                     allow_redirects=False
                 ) as resp:
-                    if resp.status not in (301, 302, 303, 307, 308):
+                    if resp.status not in REDIRECT_STATUSES:
                         _LOGGER.error("Login failed with status %d", resp.status)
+                        self.metrics.failure("login", f"http_{resp.status}")
+                        if resp.status >= 500:
+                            self.breaker.record_failure()
+                        else:
+                            self.breaker.record_success()
                         return False
 
+            self.breaker.record_success()
             self._logged_in = True
             _LOGGER.info("Successfully logged in to Centrometal portal")
             return True
 
         except Exception as err:
             _LOGGER.error("Login error: %s", err)
+            self.metrics.failure("login", type(err).__name__)
+            self.breaker.record_failure()
             return False
 
-    async def send_command(self, command: dict) -> bool:
-        """Send command to boiler."""
-        if not self._logged_in:
-            if not await self.login():
-                return False
+    async def _async_relogin(self, generation: int) -> bool:
+        """Log in again, sharing a single login between all concurrent callers."""
+        if self._logged_in and self._login_generation != generation:
+            # Another caller logged in after this one's request went out
+            return True
+        if self._login_task is None:
+            self._login_task = asyncio.ensure_future(self._login_once())
+        return await asyncio.shield(self._login_task)
 
+    async def _login_once(self) -> bool:
+        """Drop the old session cookies and log in."""
+        start = time.monotonic()
         try:
-            session = await self._get_session()
+            self._check_breaker("login")
+            self._logged_in = False
+            if self._session is not None:
+                self._session.cookie_jar.clear()
+            self.metrics.increment("logins")
+            if await self.login():
+                self._login_generation += 1
+                return True
+            return False
+        finally:
+            self.metrics.observe("login", time.monotonic() - start)
+            self._login_task = None
+
+    async def _request(self, endpoint: str, method: str, url: str, **kwargs):
+        """Send an authenticated request and return (status, JSON body).
+
+        An expired session is detected from a 401/403, a redirect to the login
+        page or HTML in place of JSON; the request is then retried once after
+        logging in again. Latency and failures are recorded per endpoint, and
+        PortalUnavailableError is raised without a request while the circuit
+        breaker is open or the request budget is spent.
+        """
+        for attempt in range(2):
+            generation = self._login_generation
+            if not self._logged_in and not await self._async_relogin(generation):
+                raise PortalAuthError("login failed")
+            generation = self._login_generation
+
+            self._check_breaker(endpoint)
+            start = time.monotonic()
+            try:
+                status, data = await self._request_once(method, url, PORTAL_TIMEOUTS[endpoint], **kwargs)
+            except PortalAuthError as err:
+                # The portal answered, only the session is gone
+                self.breaker.record_success()
+                self.metrics.failure(endpoint, "session_expired")
+                if attempt:
+                    raise
+                _LOGGER.info("Portal session expired (%s), logging in again", err)
+                if not await self._async_relogin(generation):
+                    raise
+                continue
+            except asyncio.TimeoutError:
+                self.breaker.record_failure()
+                self.metrics.failure(endpoint, "timeout")
+                raise
+            except Exception as err:
+                self.breaker.record_failure()
+                self.metrics.failure(endpoint, type(err).__name__)
+                raise
+            finally:
+                self.metrics.observe(endpoint, time.monotonic() - start)
+
+            if status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            if status != 200:
+                self.metrics.failure(endpoint, f"http_{status}")
+            return status, data
+
+    def _check_breaker(self, endpoint: str) -> None:
+        """Raise PortalUnavailableError if a request may not be sent now."""
+        try:
+            self.breaker.check()
+        except PortalUnavailableError:
+            self.metrics.failure(endpoint, "rejected")
+            raise
 
+    async def _request_once(self, method: str, url: str, timeout: float, **kwargs):
+        """Send a request with the current session cookies."""
+        session = await self._get_session()
+        async with async_timeout.timeout(timeout):
+            async with session.request(method, url, allow_redirects=False, **kwargs) as resp:
+                if resp.status in (401, 403):
+                    raise PortalAuthError(f"status {resp.status}")
+                if resp.status in REDIRECT_STATUSES:
+                    location = resp.headers.get("Location", "")
+                    if "/login" in location:
+                        raise PortalAuthError("redirected to login page")
+                    return resp.status, None
+                if resp.status != 200:
+                    return resp.status, None
+
+                if resp.content_type == "text/html":
+                    # The portal serves its login page for expired sessions
+                    raise PortalAuthError("HTML page instead of JSON")
+                return resp.status, await resp.json(content_type=None)
+
+    async def send_command(self, command: dict) -> bool:
+        """Send command to boiler."""
+        try:
             payload = {
                 "messages": {
                     self.install_id: command
@@ -88,87 +253,181 @@ class CentrometalAPI:
                 "Accept": "application/json, text/plain, */*",
             }
 
-            async with async_timeout.timeout(10):
-                async with session.post(
-                    API_CONTROL,
-                    json=payload,
-                    headers=headers
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data.get("status") == "success":
-                            _LOGGER.debug("Command sent successfully: %s", command)
-                            return True
-                        else:
-                            _LOGGER.warning("Unexpected response: %s", data)
-                            return False
-                    else:
-                        _LOGGER.error("Command failed with status %d", resp.status)
-                        return False
+            status, data = await self._request("control", "POST", API_CONTROL, json=payload, headers=headers)
+            if status == 200:
+                if isinstance(data, dict) and data.get("status") == "success":
+                    _LOGGER.debug("Command sent successfully: %s", command)
+                    return True
+                else:
+                    _LOGGER.warning("Unexpected response: %s", data)
+                    return False
+            else:
+                _LOGGER.error("Command failed with status %d", status)
+                return False
 
         except Exception as err:
             _LOGGER.error("Error sending command: %s", err)
             return False
 
+    async def queue_command(self, command: dict) -> bool:
+        """Send command to boiler, batched with others issued in the same window.
+
+        Writes to the same parameter within the window are coalesced, the last
+        one wins. Every caller gets the result of the shared POST.
+        """
+        self._pending_commands.update(command)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_futures.append(future)
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_commands())
+
+        return await asyncio.shield(future)
+
+    async def _flush_commands(self) -> None:
+        """Send all queued commands once the batch window has passed."""
+        await asyncio.sleep(COMMAND_BATCH_WINDOW)
+
+        commands, futures = self._pending_commands, self._pending_futures
+        self._pending_commands, self._pending_futures = {}, []
+        self._flush_task = None
+
+        if len(futures) > 1:
+            _LOGGER.debug("Coalesced %d commands into one request: %s", len(futures), commands)
+
+        try:
+            success = await self.send_command(commands)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Error sending queued commands: %s", err)
+            success = False
+
+        if success and any(key != "REFRESH" for key in commands):
+            # The shared status no longer reflects the installation
+            self._status_time = 0.0
+
+        for future in futures:
+            if not future.done():
+                future.set_result(success)
+
     async def turn_on(self) -> bool:
         """Turn boiler on."""
-        return await self.send_command({"PWR 99": 1})
+        return await self.queue_command({"PWR 99": 1})
 
     async def turn_off(self) -> bool:
         """Turn boiler off."""
-        return await self.send_command({"PWR 99": 0})
+        return await self.queue_command({"PWR 99": 0})
 
     async def refresh_status(self) -> bool:
-        """Request status refresh."""
-        return await self.send_command({"REFRESH": 0})
+        """Request status refresh, once for all entries asking in the same window."""
+        return await self.queue_command({"REFRESH": 0})
 
     async def get_installation_status(self) -> dict:
         """Get installation status from portal (includes PVAL parameters)."""
-        if not self._logged_in:
-            if not await self.login():
-                return {}
+        if not await self._async_update_status():
+            return {}
+        return dict(self._pvals)
+
+    async def get_installation_changes(self, since: int = 0):
+        """Return (PVAL values changed after change number since, current change number).
+
+        Pass the returned change number back in on the next call. Returns None
+        if the portal could not be reached.
+        """
+        if not await self._async_update_status():
+            return None
+        if since == self._pval_counter:
+            return {}, since
+        changes = {key: self._pvals[key] for key, changed in self._pval_changed.items() if changed > since}
+        return changes, self._pval_counter
 
+    async def _async_update_status(self) -> bool:
+        """Make sure the parsed status is recent, sharing the request between callers.
+
+        Concurrent callers share one request, and a status fetched less than
+        STATUS_SHARE_WINDOW seconds ago is not requested again.
+        """
+        if self._status_time and time.monotonic() - self._status_time < STATUS_SHARE_WINDOW:
+            return True
+
+        if self._status_task is None:
+            self._status_task = asyncio.ensure_future(self._fetch_installation_status())
+        return await asyncio.shield(self._status_task)
+
+    async def _fetch_installation_status(self) -> bool:
+        """Request the installation status and note when it succeeded."""
+        try:
+            if await self._request_installation_status():
+                self._status_time = time.monotonic()
+                return True
+            return False
+        finally:
+            self._status_task = None
+
+    async def _request_installation_status(self) -> bool:
+        """Request the installation status from the portal and parse what changed."""
         try:
-            session = await self._get_session()
             url = API_STATUS.format(install_id=self.install_id)
 
-            async with async_timeout.timeout(10):
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-
-                        # Extract PVAL_* values from params section
-                        pval_data = {}
-                        params = data.get("params", {})
-
-                        for key, value_obj in params.items():
-                            if key.startswith("PVAL_"):
-                                # Extract value from {"v": "90", "ut": "..."}
-                                if isinstance(value_obj, dict) and "v" in value_obj:
-                                    try:
-                                        # Convert to appropriate type (int or float)
-                                        val = value_obj["v"]
-                                        if isinstance(val, str):
-                                            # Try float first (handles both int and float)
-                                            pval_data[key] = float(val)
-                                        else:
-                                            pval_data[key] = val
-                                    except (ValueError, TypeError):
-                                        pval_data[key] = value_obj["v"]
-
-                        _LOGGER.debug("Retrieved %d PVAL parameters from portal", len(pval_data))
-                        return pval_data
-                    else:
-                        _LOGGER.error("Failed to get installation status: %d", resp.status)
-                        return {}
+            status, data = await self._request("status", "GET", url)
+            if status == 200 and isinstance(data, dict):
+                # Extract PVAL_* values from params section
+                params = data.get("params", {})
+                pval_ut = self._pval_ut
+                changed = 0
+
+                for key, value_obj in params.items():
+                    if key.startswith("PVAL_"):
+                        # Extract value from {"v": "90", "ut": "..."}
+                        if isinstance(value_obj, dict) and "v" in value_obj:
+                            # Skip values the portal has not updated since the last poll
+                            ut = value_obj.get("ut")
+                            if ut is not None and pval_ut.get(key) == ut:
+                                continue
+                            pval_ut[key] = ut
+
+                            try:
+                                # Convert to appropriate type (int or float)
+                                val = value_obj["v"]
+                                if isinstance(val, str):
+                                    # Try float first (handles both int and float)
+                                    val = float(val)
+                            except (ValueError, TypeError):
+                                val = value_obj["v"]
+
+                            if key not in self._pvals or self._pvals[key] != val:
+                                self._pvals[key] = val
+                                self._pval_counter += 1
+                                self._pval_changed[key] = self._pval_counter
+                                changed += 1
+
+                _LOGGER.debug("Retrieved %d PVAL parameters from portal, %d changed", len(pval_ut), changed)
+                return True
+            else:
+                _LOGGER.error("Failed to get installation status: %d", status)
+                return False
 
         except Exception as err:
             _LOGGER.error("Error getting installation status: %s", err)
-            return {}
+            return False
 
     async def close(self):
         """Close the session."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for future in self._pending_futures:
+            if not future.done():
+                future.set_result(False)
+        self._pending_commands, self._pending_futures = {}, []
+        if self._status_task:
+            self._status_task.cancel()
+            self._status_task = None
+        self._status_time = 0.0
         if self._session:
-            await self._session.close()
+            if self._owns_session:
+                await self._session.close()
+            else:
+                # Leave the shared connector and its keep-alive connections open
+                self._session.detach()
             self._session = None
         self._logged_in = False
@@ -0,0 +1,56 @@
+"""Binary sensor platform for Centrometal boiler."""
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import CONNECTION_KEY, DOMAIN
+from .entity import CentrometalEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Centrometal binary sensor entities."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([CentrometalConnectionSensor(coordinator, entry)])
+
+
+class CentrometalConnectionSensor(CentrometalEntity, BinarySensorEntity):
+    """Whether the MQTT broker connection is up."""
+
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _listen_keys = (CONNECTION_KEY,)
+
+    def __init__(self, coordinator, entry):
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        device_id = entry.data.get("device_id", entry.entry_id)
+        self._attr_name = "Centrometal MQTT Connection"
+        self._attr_unique_id = f"centrometal_{device_id}_mqtt_connection"
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if connected to the broker."""
+        return self.coordinator.mqtt_client.connected
+
+    @property
+    def available(self) -> bool:
+        """Return True, the connection state is known even without boiler data."""
+        return True
+
+    @property
+    def extra_state_attributes(self):
+        """Return how often the connection went up and down."""
+        counters = self.coordinator.metrics.counters
+        return {
+            "connects": counters.get("mqtt_connects", 0),
+            "disconnects": counters.get("mqtt_disconnects", 0),
+        }
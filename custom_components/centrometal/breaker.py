@@ -0,0 +1,142 @@
+"""Circuit breaker and request budget for the Centrometal portal."""
+from collections import deque
+import logging
+import time
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT,
+    PORTAL_REQUEST_BUDGET,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Window of the request budget (seconds)
+BUDGET_WINDOW = 60
+
+
+class PortalUnavailableError(Exception):
+    """Raised instead of sending a request while the portal is considered down."""
+
+
+class CircuitBreaker:
+    """Fails portal requests fast after repeated failures.
+
+    Closed: requests pass and consecutive failures are counted; after
+    failure_threshold of them the breaker opens. Open: requests are rejected
+    for reset_timeout seconds, doubled every time the portal is still down.
+    Half-open: a single trial request passes while the others are rejected,
+    its success closes the breaker and its failure opens it again.
+    Independently, at most budget requests are sent per minute.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        max_reset_timeout: float = BREAKER_MAX_RESET_TIMEOUT,
+        budget: int = PORTAL_REQUEST_BUDGET,
+    ):
+        """Initialize a closed breaker."""
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.budget = budget
+
+        self.failures = 0
+        self.reset_timeout = reset_timeout
+        self._opened_at: float | None = None
+        self._half_open = False
+
+        # time.monotonic() when the half-open trial request was let through, None before it
+        self._trial_started: float | None = None
+
+        # time.monotonic() of the requests sent in the last budget window
+        self._requests: deque[float] = deque()
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self._opened_at is None:
+            return STATE_HALF_OPEN if self._half_open else STATE_CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            # Let the next request find out whether the portal is back
+            self._opened_at = None
+            self._half_open = True
+            _LOGGER.info("Trying the Centrometal portal again")
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    @property
+    def available(self) -> bool:
+        """Return True if requests are currently let through."""
+        state = self.state
+        return state == STATE_CLOSED or (state == STATE_HALF_OPEN and not self._trial_running(time.monotonic()))
+
+    def _trial_running(self, now: float) -> bool:
+        """Return True while the half-open trial request is awaiting its result."""
+        # A trial that never reported back (cancelled) is given up after the base reset timeout
+        return self._trial_started is not None and now - self._trial_started < self.base_reset_timeout
+
+    def check(self) -> None:
+        """Account for a request about to be sent, or raise PortalUnavailableError."""
+        state = self.state
+        if state == STATE_OPEN:
+            raise PortalUnavailableError("portal circuit breaker is open")
+
+        now = time.monotonic()
+        if state == STATE_HALF_OPEN and self._trial_running(now):
+            raise PortalUnavailableError("waiting for the portal trial request")
+        self._prune(now)
+        if len(self._requests) >= self.budget:
+            raise PortalUnavailableError(f"request budget of {self.budget} per minute is spent")
+        self._requests.append(now)
+        if state == STATE_HALF_OPEN:
+            self._trial_started = now
+
+    def _prune(self, now: float) -> None:
+        """Forget requests older than the budget window."""
+        requests = self._requests
+        while requests and now - requests[0] >= BUDGET_WINDOW:
+            requests.popleft()
+
+    def record_success(self) -> None:
+        """Note that the portal answered."""
+        if self._half_open:
+            _LOGGER.info("Centrometal portal is reachable again")
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+        self._half_open = False
+        self._trial_started = None
+
+    def record_failure(self) -> None:
+        """Note a request that timed out, failed or got a server error."""
+        self.failures += 1
+        if self._half_open:
+            # Still down, wait longer before the next try
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+        elif self._opened_at is not None or self.failures < self.failure_threshold:
+            return
+        self._half_open = False
+        self._trial_started = None
+        self._opened_at = time.monotonic()
+        _LOGGER.warning(
+            "Centrometal portal failed %d times in a row, pausing requests for %d s",
+            self.failures, self.reset_timeout,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the breaker state for diagnostics."""
+        self._prune(time.monotonic())
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "reset_timeout": self.reset_timeout,
+            "requests_last_minute": len(self._requests),
+            "budget": self.budget,
+        }
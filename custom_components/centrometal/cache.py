@@ -0,0 +1,70 @@
+"""Last-known state cache for Centrometal boiler."""
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import CACHE_SAVE_DELAY, DOMAIN, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CentrometalStateCache:
+    """Coordinator data persisted to disk so entities can start without the network."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the cache."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._data_func = None
+        self._save_pending = False
+
+        # Derived sensor state stored next to the data, see DerivedTracker
+        self.derived = None
+        self.derived_func = None
+
+    async def async_load(self):
+        """Return (data, age in seconds) of the cached state, or None."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Could not load cached boiler state: %s", err)
+            return None
+
+        if not stored:
+            return None
+        self.derived = stored.get("derived")
+        if not stored.get("data"):
+            return None
+
+        age = max(0.0, time.time() - stored.get("saved_at", 0))
+        _LOGGER.debug("Loaded %d cached keys, %d s old", len(stored["data"]), age)
+        return stored["data"], age
+
+    @callback
+    def async_schedule_save(self, data_func) -> None:
+        """Schedule a write; data_func is only evaluated when the write happens."""
+        self._data_func = data_func
+        if self._save_pending:
+            # Don't push back a write that is already on its way
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._serialize, CACHE_SAVE_DELAY)
+
+    async def async_save_now(self) -> None:
+        """Write the cache immediately."""
+        if self._data_func is not None:
+            await self._store.async_save(self._serialize())
+
+    async def async_remove(self) -> None:
+        """Delete the cache file."""
+        await self._store.async_remove()
+
+    @callback
+    def _serialize(self) -> dict:
+        """Build the stored representation."""
+        self._save_pending = False
+        stored = {"saved_at": round(time.time()), "data": dict(self._data_func() or {})}
+        if self.derived_func is not None:
+            stored["derived"] = self.derived_func()
+        return stored
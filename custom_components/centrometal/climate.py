@@ -10,9 +10,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .entity import CentrometalEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,12 +28,13 @@ async def async_setup_entry(
     async_add_entities([CentrometalClimate(coordinator, entry)])
 
 
-class CentrometalClimate(CoordinatorEntity, ClimateEntity):
+class CentrometalClimate(CentrometalEntity, ClimateEntity):
     """Representation of Centrometal boiler as climate device."""
 
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
     _attr_hvac_modes = [HVACMode.OFF, HVACMode.HEAT]
     _attr_supported_features = ClimateEntityFeature.TURN_ON | ClimateEntityFeature.TURN_OFF
+    _listen_keys = ("C1B_onOff", "K1B_onOff", "B_STATE", "B_Tk1")
 
     def __init__(self, coordinator, entry):
         """Initialize the climate device."""
@@ -64,13 +65,11 @@ class CentrometalClimate(CoordinatorEntity, ClimateEntity):
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
+        # Send command via API (batched, PVAL_99_0 shown optimistically until confirmed)
         if hvac_mode == HVACMode.HEAT:
-            await self.coordinator.api.turn_on()
+            await self.coordinator.async_write_value("PVAL_99_0", {"PWR 99": 1}, 1)
         elif hvac_mode == HVACMode.OFF:
-            await self.coordinator.api.turn_off()
-
-        # Request data refresh
-        await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_value("PVAL_99_0", {"PWR 99": 0}, 0)
 
     async def async_turn_on(self) -> None:
         """Turn the entity on."""
@@ -1,14 +1,38 @@
 """Config flow for Centrometal integration."""
 import logging
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 import homeassistant.helpers.config_validation as cv
 
 from .api import CentrometalAPI
-from .const import DOMAIN, CONF_DEVICE_ID, DEFAULT_INSTALL_ID
+from .const import (
+    DOMAIN,
+    CONF_AGGREGATE_WINDOWS,
+    CONF_CACHE_MAX_AGE,
+    CONF_DEADBANDS,
+    CONF_DEVICE_ID,
+    CONF_HEARTBEAT,
+    CONF_HISTORY_HOURS,
+    CONF_HISTORY_SPILL,
+    CONF_MQTT_TRANSPORT,
+    CONF_STALE_AFTER,
+    CONF_TRACK_COMMANDS,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_INSTALL_ID,
+    DEFAULT_MQTT_TRANSPORT,
+    DEFAULT_STALE_AFTER,
+    MQTT_TRANSPORT_ASYNCIO,
+    MQTT_TRANSPORT_PAHO,
+)
+from .aggregates import parse_windows
+from .filters import parse_deadbands
+from .sensor_definitions import DEFAULT_HEARTBEAT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +49,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
@@ -35,7 +65,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             api = CentrometalAPI(
                 user_input[CONF_EMAIL],
                 user_input[CONF_PASSWORD],
-                DEFAULT_INSTALL_ID
+                DEFAULT_INSTALL_ID,
+                async_create_clientsession(
+                    self.hass, auto_cleanup=False, cookie_jar=aiohttp.CookieJar()
+                ),
             )
 
             try:
@@ -67,3 +100,69 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=DATA_SCHEMA,
             errors=errors
         )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Centrometal options."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow."""
+        # Kept under its own name, OptionsFlow.config_entry only exists since HA 2024.11
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        errors = {}
+        if user_input is not None:
+            try:
+                parse_deadbands(user_input.get(CONF_DEADBANDS, ""))
+            except ValueError:
+                errors[CONF_DEADBANDS] = "invalid_deadbands"
+            try:
+                parse_windows(user_input.get(CONF_AGGREGATE_WINDOWS, ""))
+            except ValueError:
+                errors[CONF_AGGREGATE_WINDOWS] = "invalid_windows"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        options_schema = vol.Schema({
+            vol.Optional(
+                CONF_MQTT_TRANSPORT,
+                default=options.get(CONF_MQTT_TRANSPORT, DEFAULT_MQTT_TRANSPORT),
+            ): vol.In([MQTT_TRANSPORT_PAHO, MQTT_TRANSPORT_ASYNCIO]),
+            vol.Optional(
+                CONF_CACHE_MAX_AGE,
+                default=options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_DEADBANDS,
+                default=options.get(CONF_DEADBANDS, ""),
+            ): cv.string,
+            vol.Optional(
+                CONF_HEARTBEAT,
+                default=options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_AGGREGATE_WINDOWS,
+                default=options.get(CONF_AGGREGATE_WINDOWS, ""),
+            ): cv.string,
+            vol.Optional(
+                CONF_HISTORY_HOURS,
+                default=options.get(CONF_HISTORY_HOURS, DEFAULT_HISTORY_HOURS),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=168)),
+            vol.Optional(
+                CONF_HISTORY_SPILL,
+                default=options.get(CONF_HISTORY_SPILL, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_TRACK_COMMANDS,
+                default=options.get(CONF_TRACK_COMMANDS, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_STALE_AFTER,
+                default=options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        })
+
+        return self.async_show_form(step_id="init", data_schema=options_schema, errors=errors)
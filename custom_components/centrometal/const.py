@@ -2,9 +2,43 @@
 
 DOMAIN = "centrometal"
 
+# hass.data key of the MQTT connection shared by all config entries
+DATA_MQTT_HUB = f"{DOMAIN}_mqtt_hub"
+
+# hass.data key of the portal clients shared by config entries of the same account
+DATA_API_CLIENTS = f"{DOMAIN}_api_clients"
+
 # Configuration
 CONF_DEVICE_ID = "device_id"
 
+# Options
+CONF_MQTT_TRANSPORT = "mqtt_transport"
+MQTT_TRANSPORT_PAHO = "paho"
+MQTT_TRANSPORT_ASYNCIO = "asyncio"
+DEFAULT_MQTT_TRANSPORT = MQTT_TRANSPORT_PAHO
+CONF_CACHE_MAX_AGE = "cache_max_age"
+DEFAULT_CACHE_MAX_AGE = 60  # minutes
+CONF_DEADBANDS = "deadbands"  # per-sensor overrides, "B_Tdpl1=2, B_Oxy1=0.2"
+CONF_HEARTBEAT = "heartbeat"  # seconds, defaults in sensor_definitions
+CONF_AGGREGATE_WINDOWS = "aggregate_windows"  # minutes, "1, 5"; empty disables
+CONF_HISTORY_HOURS = "history_hours"  # 0 disables the sample history
+DEFAULT_HISTORY_HOURS = 6
+CONF_HISTORY_SPILL = "history_spill"  # keep the sample history in a memory-mapped file
+CONF_TRACK_COMMANDS = "track_commands"  # follow commands on the server topic (cm/srv)
+CONF_STALE_AFTER = "stale_after"  # minutes without MQTT updates of a key, 0 disables the watchdog
+DEFAULT_STALE_AFTER = 15
+
+# Services
+SERVICE_GET_HISTORY = "get_history"
+ATTR_KEYS = "keys"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+# Persistent state cache
+STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 60  # seconds
+
 # Default installation ID (same for all users)
 DEFAULT_INSTALL_ID = "1844"
 
@@ -15,6 +49,60 @@ LOGIN_POST = PORTAL_URL + "/login_check"
 API_CONTROL = PORTAL_URL + "/api/inst/control/multiple"
 API_STATUS = PORTAL_URL + "/wdata/data/installation-status/{install_id}"
 
+# Portal request timeouts per endpoint (seconds)
+PORTAL_TIMEOUTS = {"login": 10, "status": 8, "control": 5}
+
+# Stop sending portal requests after this many consecutive failures, for a
+# pause (seconds) that doubles while the portal stays down
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 30
+BREAKER_MAX_RESET_TIMEOUT = 600
+
+# Portal requests per minute, shared by all config entries of an account
+PORTAL_REQUEST_BUDGET = 20
+
+# Portal polling interval bounds (seconds); stretched while MQTT is fresh
+POLL_INTERVAL_MIN = 60
+POLL_INTERVAL_MAX = 600
+
+# Commands issued within this window (seconds) are sent in one request
+COMMAND_BATCH_WINDOW = 0.3
+
+# Installation status fetched within this time (seconds) is shared instead of requested again
+STATUS_SHARE_WINDOW = 30
+
+# Optimistic values not confirmed by MQTT or the portal within this time (seconds) are rolled back
+OPTIMISTIC_TIMEOUT = 150
+
+# MQTT data older than this (seconds) is considered stale
+MQTT_FRESH_SECONDS = 120
+
+# Derived pellet and energy estimates
+PELLET_HEATING_VALUE = 4.8  # kWh per kg of wood pellets
+BOILER_EFFICIENCY = 0.9
+DERIVED_WINDOW = 3600  # seconds over which duty cycle and starts per hour are computed
+
+# Check for ended aggregate windows this often (seconds), even without new samples
+AGGREGATE_ROLL_INTERVAL = 10
+
+# Check for held back deadband values whose heartbeat is due this often (seconds)
+DEADBAND_FLUSH_INTERVAL = 30
+
+# Log one MQTT message summary per this many messages
+MQTT_LOG_SAMPLE = 100
+
+# Refresh the diagnostic metric sensors this often (seconds)
+METRICS_SENSOR_INTERVAL = 60
+
+# Pseudo data key dispatched when the broker connection goes up or down
+CONNECTION_KEY = "mqtt_connection"
+
+# Look for silent keys and a stalled MQTT stream this often (seconds)
+WATCHDOG_INTERVAL = 30
+
+# Wait this long (seconds) after asking the boiler to resend its values before marking keys stale
+WATCHDOG_REFRESH_GRACE = 60
+
 # MQTT (for monitoring - optional)
 MQTT_BROKER = "136.243.62.164"
 MQTT_PORT = 1883
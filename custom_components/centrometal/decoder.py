@@ -0,0 +1,25 @@
+"""MQTT payload decoding for Centrometal boiler."""
+import json
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+
+def decode_json(raw: bytes) -> dict:
+    """Decode a JSON payload with the standard library."""
+    # json.loads detects the encoding of bytes itself, no .decode() copy needed
+    return json.loads(raw)
+
+
+def decode_orjson(raw: bytes) -> dict:
+    """Decode a JSON payload with orjson."""
+    return orjson.loads(raw)
+
+
+# Fastest decoder available; orjson.JSONDecodeError subclasses json.JSONDecodeError
+decode_payload = decode_orjson if orjson is not None else decode_json
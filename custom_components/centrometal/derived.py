@@ -0,0 +1,100 @@
+"""Pellet, energy and burner statistics derived from the boiler counters."""
+import logging
+
+from .const import BOILER_EFFICIENCY, DERIVED_WINDOW, PELLET_HEATING_VALUE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Data keys the derived values are computed from
+BURNER_WORK_KEY = "CNT_0"  # minutes
+BURNER_STARTS_KEY = "CNT_3"
+NOMINAL_POWER_KEY = "B_sng"  # kW
+
+
+def _number(value):
+    """Return value as a float, or None."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class DerivedTracker:
+    """Accumulates counter deltas into energy, pellet and burner statistics.
+
+    Every update is O(1): energy grows by the burner minutes since the last
+    update times the nominal power, duty cycle and starts per hour are
+    computed over consecutive windows of DERIVED_WINDOW seconds.
+    """
+
+    def __init__(self):
+        """Initialize an empty tracker."""
+        # Heat produced since the tracker started (kWh)
+        self.energy = 0.0
+        self.duty_cycle = None
+        self.starts_per_hour = None
+
+        # Last burner counter accounted for in energy
+        self._burner = None
+
+        # Start of the current window (wall clock) and the counters at that time
+        self._window_start = None
+        self._window_burner = None
+        self._window_starts = None
+
+    @property
+    def pellets(self) -> float:
+        """Return the estimated pellet consumption (kg)."""
+        return self.energy / (BOILER_EFFICIENCY * PELLET_HEATING_VALUE)
+
+    def as_dict(self) -> dict:
+        """Return the state to persist."""
+        return {
+            "energy": self.energy,
+            "duty_cycle": self.duty_cycle,
+            "starts_per_hour": self.starts_per_hour,
+            "burner": self._burner,
+            "window_start": self._window_start,
+            "window_burner": self._window_burner,
+            "window_starts": self._window_starts,
+        }
+
+    def restore(self, state: dict) -> None:
+        """Continue from persisted state."""
+        self.energy = state.get("energy", 0.0)
+        self.duty_cycle = state.get("duty_cycle")
+        self.starts_per_hour = state.get("starts_per_hour")
+        self._burner = state.get("burner")
+        self._window_start = state.get("window_start")
+        self._window_burner = state.get("window_burner")
+        self._window_starts = state.get("window_starts")
+
+    def update(self, data: dict, now: float) -> tuple[str, ...]:
+        """Account for the current counters; return the derived keys that changed."""
+        burner = _number(data.get(BURNER_WORK_KEY))
+        if burner is None:
+            return ()
+        starts = _number(data.get(BURNER_STARTS_KEY))
+        changed = ()
+
+        if self._burner is None or burner < self._burner:
+            # First sample or a counter reset, start from here
+            self._burner = burner
+        elif burner > self._burner:
+            power = _number(data.get(NOMINAL_POWER_KEY))
+            if power is not None:
+                self.energy += (burner - self._burner) / 60 * power
+                self._burner = burner
+                changed = ("derived_energy", "derived_pellets")
+
+        if self._window_start is None or burner < self._window_burner:
+            self._window_start, self._window_burner, self._window_starts = now, burner, starts
+        elif now - self._window_start >= DERIVED_WINDOW:
+            minutes = (now - self._window_start) / 60
+            self.duty_cycle = round(min(100.0, (burner - self._window_burner) / minutes * 100), 1)
+            if starts is not None and self._window_starts is not None and starts >= self._window_starts:
+                self.starts_per_hour = round((starts - self._window_starts) / minutes * 60, 2)
+            self._window_start, self._window_burner, self._window_starts = now, burner, starts
+            changed += ("derived_duty_cycle", "derived_starts_per_hour")
+
+        return changed
@@ -0,0 +1,51 @@
+"""Diagnostics support for Centrometal boiler."""
+import time
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {"email", "password"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    mqtt_client = coordinator.mqtt_client
+    api = coordinator.api
+    now = time.monotonic()
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "keys": len(coordinator.data or {}),
+            "stale": coordinator.stale,
+            "mqtt_fresh": coordinator.mqtt_fresh,
+            "poll_interval": coordinator.update_interval.total_seconds(),
+            "pending_writes": sorted(coordinator._pending_writes),
+            "deadband_suppressed": coordinator.value_filter.suppressed if coordinator.value_filter else None,
+        },
+        "watchdog": {
+            "stale_after": coordinator.stale_after,
+            "stale_keys": sorted(coordinator.stale_keys),
+            "seconds_since_seen": {key: round(now - seen) for key, seen in sorted(coordinator.last_seen.items())},
+        },
+        "mqtt": {
+            "connected": mqtt_client.connected,
+            "transport": mqtt_client.transport,
+            "shared_devices": mqtt_client.hub.refcount if mqtt_client.hub else 0,
+            "seconds_since_message": round(now - mqtt_client.hub.last_message) if mqtt_client.hub else None,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "portal": {
+            "logged_in": api._logged_in,
+            "shared_entries": api.refcount,
+            "breaker": api.breaker.as_dict(),
+            "metrics": api.metrics.as_dict(),
+        },
+    }
@@ -0,0 +1,42 @@
+"""Base entity for Centrometal boiler."""
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class CentrometalEntity(CoordinatorEntity):
+    """Coordinator entity that is only woken by MQTT changes to its own keys."""
+
+    # Data keys this entity renders; MQTT updates to other keys are ignored
+    _listen_keys: tuple = ()
+
+    async def async_added_to_hass(self) -> None:
+        """Register key listeners when added to hass."""
+        await super().async_added_to_hass()
+        for key in self._listen_keys:
+            self.async_on_remove(
+                self.coordinator.async_add_key_listener(key, self._handle_key_update)
+            )
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        # Values restored from an outdated cache are not trusted, nor values
+        # the watchdog found silent for longer than the configured time
+        stale_keys = self.coordinator.stale_keys
+        return (
+            super().available
+            and not self.coordinator.stale
+            and not (stale_keys and self._listen_keys and stale_keys.issuperset(self._listen_keys))
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        # Portal polls that changed nothing don't need a state write
+        if not self.coordinator.unchanged:
+            super()._handle_coordinator_update()
+
+    @callback
+    def _handle_key_update(self) -> None:
+        """Handle a change of one of the listened keys."""
+        self.async_write_ha_state()
@@ -0,0 +1,80 @@
+"""Deadband filter for noisy Centrometal sensors."""
+from .sensor_definitions import DEFAULT_HEARTBEAT, SENSOR_DEADBANDS
+
+
+def parse_deadbands(text: str) -> dict[str, float]:
+    """Parse deadband overrides written as "B_Tdpl1=2, B_Oxy1=0.2".
+
+    Raises ValueError if an entry can't be parsed.
+    """
+    deadbands = {}
+    for item in text.replace(";", ",").split(","):
+        if not item.strip():
+            continue
+        key, sep, value = item.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"expected KEY=value, got {item.strip()!r}")
+        deadband = float(value)
+        if deadband < 0:
+            raise ValueError(f"negative deadband for {key.strip()}")
+        deadbands[key.strip()] = deadband
+    return deadbands
+
+
+class DeadbandFilter:
+    """Hold back sensor changes that stay within a deadband of the last published value."""
+
+    def __init__(self, deadbands: dict[str, float], heartbeat: float = DEFAULT_HEARTBEAT):
+        """Initialize the filter; a deadband of 0 publishes every change."""
+        self.deadbands = {key: value for key, value in deadbands.items() if value > 0}
+        self.heartbeat = heartbeat
+        self.suppressed = 0
+
+        # Last published value and when it was published, per filtered key
+        self._published: dict[str, tuple[float, float]] = {}
+
+        # Latest value held back, per key, until it leaves the deadband or the heartbeat is due
+        self._held: dict[str, float] = {}
+
+    @classmethod
+    def from_options(cls, overrides: str = "", heartbeat: float = DEFAULT_HEARTBEAT) -> "DeadbandFilter":
+        """Build a filter from the sensor defaults and the overrides in the options."""
+        deadbands = dict(SENSOR_DEADBANDS)
+        if overrides:
+            deadbands.update(parse_deadbands(overrides))
+        return cls(deadbands, heartbeat)
+
+    def accept(self, key: str, value, now: float) -> bool:
+        """Return True if a new value of key should be published."""
+        deadband = self.deadbands.get(key)
+        if deadband is None:
+            return True
+
+        try:
+            number = float(value)
+        except (ValueError, TypeError):
+            # Not a number, always pass it and start over
+            self._published.pop(key, None)
+            self._held.pop(key, None)
+            return True
+
+        published = self._published.get(key)
+        if (
+            published is None
+            or abs(number - published[0]) >= deadband
+            or now - published[1] >= self.heartbeat
+        ):
+            self._published[key] = (number, now)
+            self._held.pop(key, None)
+            return True
+
+        self._held[key] = number
+        self.suppressed += 1
+        return False
+
+    def flush(self, now: float) -> list[str]:
+        """Publish held back values whose heartbeat is due and return their keys."""
+        due = [key for key in self._held if now - self._published[key][1] >= self.heartbeat]
+        for key in due:
+            self._published[key] = (self._held.pop(key), now)
+        return due
@@ -0,0 +1,186 @@
+"""In-memory time series of recent MQTT samples for Centrometal boiler."""
+from bisect import bisect_left, bisect_right
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+import zlib
+
+from .sensor_definitions import ALL_SENSORS, VALUE_CONVERTERS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Samples closer together than this (seconds) share a slot, the latest value wins
+HISTORY_RESOLUTION = 5
+
+# Spill file header: magic, samples per key, CRC of the key layout
+_FILE_HEADER = struct.Struct("<8sqq")
+_FILE_MAGIC = b"CMHIST01"
+
+# Per-key slot header: index of the oldest sample, number of samples
+_SLOT_HEADER = struct.Struct("<qq")
+
+
+class RingBuffer:
+    """Fixed-size ring of (timestamp, value) doubles over a flat buffer.
+
+    The buffer is a bytearray in memory or a slice of a memory-mapped file;
+    both are laid out as a slot header, then all timestamps, then all values.
+    """
+
+    __slots__ = ("capacity", "_view", "_header", "_times", "_values")
+
+    def __init__(self, buffer, capacity: int):
+        """Initialize the ring over a buffer of slot_size(capacity) bytes."""
+        self.capacity = capacity
+        self._view = memoryview(buffer)
+        offset = _SLOT_HEADER.size
+        self._header = self._view[:offset].cast("q")
+        self._times = self._view[offset:offset + 8 * capacity].cast("d")
+        self._values = self._view[offset + 8 * capacity:offset + 16 * capacity].cast("d")
+
+    @staticmethod
+    def slot_size(capacity: int) -> int:
+        """Return the number of bytes a ring of capacity samples takes."""
+        return _SLOT_HEADER.size + 16 * capacity
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._header[1]
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        start, count = self._header[0], self._header[1]
+        if count:
+            last = (start + count - 1) % self.capacity
+            if timestamp - self._times[last] < HISTORY_RESOLUTION:
+                self._values[last] = value
+                return
+        if count < self.capacity:
+            index = (start + count) % self.capacity
+            self._header[1] = count + 1
+        else:
+            index = start
+            self._header[0] = (start + 1) % self.capacity
+        self._times[index] = timestamp
+        self._values[index] = value
+
+    def query(self, start_time: float, end_time: float) -> list[tuple[float, float]]:
+        """Return the samples with start_time <= timestamp <= end_time, oldest first."""
+        start, count = self._header[0], self._header[1]
+        times, values = self._times, self._values
+        # The ring is two sorted runs: [start, capacity) and [0, wrapped end)
+        end = start + count
+        runs = ((start, min(end, self.capacity)), (0, max(0, end - self.capacity)))
+        samples = []
+        for low, high in runs:
+            if low >= high:
+                continue
+            first = bisect_left(times, start_time, low, high)
+            last = bisect_right(times, end_time, first, high)
+            samples.extend(zip(times[first:last], values[first:last]))
+        return samples
+
+    def release(self) -> None:
+        """Release the views on the underlying buffer."""
+        for view in (self._header, self._times, self._values, self._view):
+            view.release()
+
+
+class HistoryBuffer:
+    """Ring buffers of the last hours of MQTT samples, one per numeric key."""
+
+    def __init__(self, hours: float, path: str | None = None):
+        """Initialize buffers; with a path they are spilled to a memory-mapped file."""
+        self.hours = hours
+        self.path = path
+        self.capacity = max(1, int(hours * 3600 / HISTORY_RESOLUTION))
+        self._buffers: dict[str, RingBuffer] = {}
+
+        # Slot order in the spill file, fixed by the sensor definitions
+        self._slots = {key: index for index, key in enumerate(sorted(ALL_SENSORS))}
+        self._file = None
+        self._mmap = None
+        self._map_view = None
+
+    def open(self) -> None:
+        """Map the spill file, keeping its samples if the layout still matches (blocking)."""
+        if self.path is None:
+            return
+        slot_size = RingBuffer.slot_size(self.capacity)
+        size = _FILE_HEADER.size + slot_size * len(self._slots)
+        layout = zlib.crc32(",".join(sorted(self._slots)).encode())
+        header = _FILE_HEADER.pack(_FILE_MAGIC, self.capacity, layout)
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        mode = "r+b" if os.path.exists(self.path) else "w+b"
+        self._file = open(self.path, mode)  # pylint: disable=consider-using-with
+        if self._file.read(_FILE_HEADER.size) != header or os.fstat(self._file.fileno()).st_size != size:
+            _LOGGER.debug("Creating history file %s (%d bytes)", self.path, size)
+            self._file.truncate(0)
+            self._file.truncate(size)
+            self._file.seek(0)
+            self._file.write(header)
+            self._file.flush()
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+
+        self._map_view = memoryview(self._mmap)
+
+        # Pick up the samples of keys recorded before the restart
+        for key in self._slots:
+            buffer = self._create(key)
+            if len(buffer):
+                self._buffers[key] = buffer
+            else:
+                buffer.release()
+
+    def close(self) -> None:
+        """Flush and unmap the spill file (blocking)."""
+        for buffer in self._buffers.values():
+            buffer.release()
+        self._buffers.clear()
+        if self._map_view is not None:
+            self._map_view.release()
+            self._map_view = None
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def add(self, key: str, raw, timestamp: float | None = None) -> None:
+        """Record a raw MQTT value of key."""
+        if key not in self._slots:
+            return
+        try:
+            value = float(raw)
+        except (ValueError, TypeError):
+            # Text values like the boiler state are not recorded
+            return
+        if VALUE_CONVERTERS[key](raw) is None:
+            # Disconnected sensor
+            value = math.nan
+
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = self._create(key)
+        buffer.append(time.time() if timestamp is None else timestamp, value)
+
+    def query(self, keys, start_time: float, end_time: float) -> dict[str, list[tuple[float, float]]]:
+        """Return the samples of keys between two timestamps."""
+        return {
+            key: self._buffers[key].query(start_time, end_time) if key in self._buffers else []
+            for key in keys
+        }
+
+    def _create(self, key: str) -> RingBuffer:
+        """Create the buffer of a key seen for the first time."""
+        if self._map_view is not None:
+            slot_size = RingBuffer.slot_size(self.capacity)
+            offset = _FILE_HEADER.size + self._slots[key] * slot_size
+            return RingBuffer(self._map_view[offset:offset + slot_size], self.capacity)
+        return RingBuffer(bytearray(RingBuffer.slot_size(self.capacity)), self.capacity)
@@ -0,0 +1,100 @@
+"""Counters and latency histograms of the Centrometal hot paths."""
+from bisect import bisect_left
+
+# Upper bounds of the latency buckets (seconds), the last bucket is open-ended
+LATENCY_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 150.0,
+)
+
+
+class Histogram:
+    """Latency distribution over fixed buckets, O(log buckets) per sample."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one sample."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the bucket bound below which fraction of the samples fall (seconds)."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        if index == len(LATENCY_BUCKETS):
+            return self.max
+        return min(LATENCY_BUCKETS[index], self.max)
+
+    def as_dict(self) -> dict:
+        """Return a summary in milliseconds."""
+        if not self.count:
+            return {"count": 0}
+        bounds = [f"le_{bound * 1000:g}ms" for bound in LATENCY_BUCKETS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "buckets": {bound: count for bound, count in zip(bounds, self.counts) if count},
+        }
+
+
+class Metrics:
+    """Named counters, latency histograms and failure reasons.
+
+    Updated from the MQTT thread and the event loop without locking; a
+    diagnostics snapshot may be off by a sample in flight.
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self.failures: dict[str, dict[str, int]] = {}
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a latency sample."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def failure(self, operation: str, reason: str) -> None:
+        """Count a failed operation by reason."""
+        reasons = self.failures.setdefault(operation, {})
+        reasons[reason] = reasons.get(reason, 0) + 1
+
+    def percentile(self, name: str, fraction: float) -> float | None:
+        """Return a latency percentile (seconds), or None without samples."""
+        histogram = self.histograms.get(name)
+        return histogram.percentile(fraction) if histogram is not None else None
+
+    def as_dict(self) -> dict:
+        """Return a snapshot for diagnostics."""
+        return {
+            "counters": dict(self.counters),
+            "latency": {name: histogram.as_dict() for name, histogram in list(self.histograms.items())},
+            "failures": {operation: dict(reasons) for operation, reasons in list(self.failures.items())},
+        }
@@ -0,0 +1,282 @@
+"""Minimal asyncio-native MQTT 3.1.1 client for the Centrometal broker.
+
+Only what the integration needs is implemented: a clean-session connect with
+username/password, QoS 0 subscriptions, receiving publishes and keepalive
+pings. Everything runs on the event loop, so no extra thread is needed.
+"""
+import asyncio
+import logging
+import random
+import struct
+from typing import Callable, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Control packet types (upper nibble of the fixed header)
+CONNECT = 0x10
+CONNACK = 0x20
+PUBLISH = 0x30
+PUBACK = 0x40
+PUBREC = 0x50
+PUBREL = 0x60
+PUBCOMP = 0x70
+SUBSCRIBE = 0x80
+SUBACK = 0x90
+UNSUBSCRIBE = 0xA0
+UNSUBACK = 0xB0
+PINGREQ = 0xC0
+PINGRESP = 0xD0
+DISCONNECT = 0xE0
+
+CONNECT_TIMEOUT = 10
+
+# Reconnect backoff (seconds): the ceiling doubles with every failed attempt up
+# to the maximum and the delay is drawn at random below it, so the many clients
+# of the shared broker don't all come back at the same moment after it restarts
+RECONNECT_MIN_DELAY = 1
+RECONNECT_BASE_DELAY = 5
+RECONNECT_MAX_DELAY = 120
+
+
+class MQTTConnectionError(Exception):
+    """Raised when the broker refuses or drops the connection."""
+
+
+def _encode_string(value: str) -> bytes:
+    """Encode a length-prefixed UTF-8 string."""
+    data = value.encode()
+    return struct.pack("!H", len(data)) + data
+
+
+def _encode_length(length: int) -> bytes:
+    """Encode the remaining length as an MQTT variable byte integer."""
+    encoded = bytearray()
+    while True:
+        byte = length % 128
+        length //= 128
+        if length:
+            byte |= 0x80
+        encoded.append(byte)
+        if not length:
+            return bytes(encoded)
+
+
+def _packet(header: int, body: bytes = b"") -> bytes:
+    """Build a complete control packet."""
+    return bytes((header,)) + _encode_length(len(body)) + body
+
+
+def reconnect_delay(attempt: int) -> float:
+    """Return the jittered delay before reconnect attempt number attempt (from 0)."""
+    ceiling = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** min(attempt, 16))
+    return random.uniform(RECONNECT_MIN_DELAY, ceiling)
+
+
+class AsyncioMQTTClient:
+    """MQTT client that reads the broker socket directly on the event loop."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        keepalive: int = 60,
+        client_id: str = "",
+    ):
+        """Initialize the client."""
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.keepalive = keepalive
+        self.client_id = client_id
+
+        # Callbacks, all invoked on the event loop
+        self.on_connect: Optional[Callable[[], None]] = None
+        self.on_message: Optional[Callable[[str, bytes], None]] = None
+        self.on_disconnect: Optional[Callable[[], None]] = None
+
+        self.connected = False
+        self._topics: set[str] = set()
+
+        # Failed connection attempts since the last successful CONNACK
+        self._attempt = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._packet_id = 0
+        self._stopping = False
+
+    def subscribe(self, topic: str) -> None:
+        """Subscribe to a topic, now and after every reconnect."""
+        self._topics.add(topic)
+        if self.connected:
+            self._send_subscribe(topic)
+
+    def unsubscribe(self, topic: str) -> None:
+        """Unsubscribe from a topic."""
+        self._topics.discard(topic)
+        if self.connected:
+            self._write(_packet(UNSUBSCRIBE | 0x02, struct.pack("!H", self._next_packet_id()) + _encode_string(topic)))
+
+    async def run(self) -> None:
+        """Connect and keep reconnecting with jittered exponential backoff until stopped."""
+        while not self._stopping:
+            try:
+                await self._run_once()
+            except (
+                OSError,
+                asyncio.IncompleteReadError,
+                asyncio.TimeoutError,
+                MQTTConnectionError,
+                struct.error,
+                UnicodeDecodeError,
+            ) as err:
+                if self._stopping:
+                    break
+                _LOGGER.warning("MQTT connection lost (%s)", err)
+            except Exception:  # pylint: disable=broad-except
+                if self._stopping:
+                    break
+                _LOGGER.exception("Unexpected MQTT error")
+            finally:
+                self._close()
+
+            if self._stopping:
+                break
+            # Drawn after the session, so a CONNACK since the last failure starts over
+            delay = reconnect_delay(self._attempt)
+            self._attempt += 1
+            _LOGGER.info("Reconnecting to the MQTT broker in %.1f s", delay)
+            await asyncio.sleep(delay)
+
+    def reconnect(self) -> None:
+        """Drop the current broker session, run() then connects again."""
+        if self._writer is not None:
+            self._writer.close()
+
+    async def stop(self) -> None:
+        """Disconnect cleanly and stop reconnecting."""
+        self._stopping = True
+        if self.connected:
+            self._write(_packet(DISCONNECT))
+            try:
+                await self._writer.drain()
+            except OSError:
+                pass
+        self._close()
+
+    async def _run_once(self) -> None:
+        """Run a single broker session until it ends."""
+        _LOGGER.info("Connecting to MQTT broker %s:%s", self.host, self.port)
+        reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), CONNECT_TIMEOUT
+        )
+        self._write(self._connect_packet())
+
+        header, body = await asyncio.wait_for(self._read_packet(reader), CONNECT_TIMEOUT)
+        if header & 0xF0 != CONNACK or len(body) < 2:
+            raise MQTTConnectionError("unexpected packet instead of CONNACK")
+        if body[1] != 0:
+            raise MQTTConnectionError(f"connection refused, return code {body[1]}")
+
+        self.connected = True
+        self._attempt = 0
+        # Clean session: the broker forgot every subscription, renew them all
+        for topic in self._topics:
+            self._send_subscribe(topic)
+        if self.on_connect:
+            self.on_connect()
+
+        pinger = asyncio.get_running_loop().create_task(self._ping_loop())
+        try:
+            while True:
+                # The pinger guarantees traffic, so silence means a dead link
+                header, body = await asyncio.wait_for(
+                    self._read_packet(reader), self.keepalive * 1.5
+                )
+                self._handle_packet(header, body)
+        finally:
+            pinger.cancel()
+
+    async def _ping_loop(self) -> None:
+        """Send PINGREQ well within the keepalive interval."""
+        while True:
+            await asyncio.sleep(self.keepalive / 2)
+            self._write(_packet(PINGREQ))
+
+    async def _read_packet(self, reader: asyncio.StreamReader) -> tuple[int, bytes]:
+        """Read one control packet."""
+        header = (await reader.readexactly(1))[0]
+        length = 0
+        multiplier = 1
+        while True:
+            byte = (await reader.readexactly(1))[0]
+            length += (byte & 0x7F) * multiplier
+            if not byte & 0x80:
+                break
+            multiplier *= 128
+        body = await reader.readexactly(length) if length else b""
+        return header, body
+
+    def _handle_packet(self, header: int, body: bytes) -> None:
+        """Dispatch a received control packet."""
+        packet_type = header & 0xF0
+        if packet_type == PUBLISH:
+            qos = (header >> 1) & 0x03
+            topic_length = struct.unpack_from("!H", body)[0]
+            topic = body[2:2 + topic_length].decode()
+            offset = 2 + topic_length
+            if qos:
+                packet_id = body[offset:offset + 2]
+                offset += 2
+                self._write(_packet(PUBACK if qos == 1 else PUBREC, packet_id))
+            if self.on_message:
+                self.on_message(topic, body[offset:])
+        elif packet_type == PUBREL:
+            self._write(_packet(PUBCOMP, body[:2]))
+        elif packet_type == SUBACK:
+            if b"\x80" in body[2:]:
+                _LOGGER.error("MQTT broker rejected subscription (packet %s)", struct.unpack_from("!H", body)[0])
+        elif packet_type in (PINGRESP, UNSUBACK, PUBACK, PUBCOMP):
+            pass
+        else:
+            _LOGGER.debug("Ignoring MQTT packet type 0x%02x", packet_type)
+
+    def _connect_packet(self) -> bytes:
+        """Build the CONNECT packet."""
+        flags = 0x02  # clean session
+        payload = _encode_string(self.client_id)
+        if self.username:
+            flags |= 0x80
+            payload += _encode_string(self.username)
+        if self.password:
+            flags |= 0x40
+            payload += _encode_string(self.password)
+        body = _encode_string("MQTT") + struct.pack("!BBH", 4, flags, self.keepalive) + payload
+        return _packet(CONNECT, body)
+
+    def _send_subscribe(self, topic: str) -> None:
+        """Send a QoS 0 SUBSCRIBE for a topic."""
+        body = struct.pack("!H", self._next_packet_id()) + _encode_string(topic) + b"\x00"
+        self._write(_packet(SUBSCRIBE | 0x02, body))
+        _LOGGER.info("Subscribed to topic: %s", topic)
+
+    def _next_packet_id(self) -> int:
+        """Return the next non-zero packet identifier."""
+        self._packet_id = self._packet_id % 0xFFFF + 1
+        return self._packet_id
+
+    def _write(self, data: bytes) -> None:
+        """Queue bytes on the socket."""
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(data)
+
+    def _close(self) -> None:
+        """Close the socket and report the disconnection."""
+        was_connected = self.connected
+        self.connected = False
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if was_connected and not self._stopping and self.on_disconnect:
+            self.on_disconnect()
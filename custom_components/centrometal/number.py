@@ -5,9 +5,9 @@ from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .entity import CentrometalEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,7 +50,7 @@ async def async_setup_entry(
     async_add_entities(numbers)
 
 
-class CentrometalNumber(CoordinatorEntity, NumberEntity):
+class CentrometalNumber(CentrometalEntity, NumberEntity):
     """Representation of a Centrometal number."""
 
     def __init__(
@@ -72,6 +72,7 @@ class CentrometalNumber(CoordinatorEntity, NumberEntity):
         super().__init__(coordinator)
         self._command = command
         self._state_key = state_key
+        self._listen_keys = (state_key,)
         self._attr_name = f"Centrometal {name}"
         self._attr_unique_id = f"centrometal_{entry.data.get('device_id', entry.entry_id)}_{number_id}"
         self._attr_icon = icon
@@ -85,30 +86,16 @@ class CentrometalNumber(CoordinatorEntity, NumberEntity):
     @property
     def native_value(self):
         """Return the current value."""
-        value = self.coordinator.data.get(self._state_key)
-        if value is None:
-            return None
-        # Convert to float
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
+        return self.coordinator.values.get(self._state_key)
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
         _LOGGER.info("Setting %s to %s (command: %s = %s)", self._attr_name, value, self._command, value)
 
-        # Send command via API
-        success = await self.coordinator.api.send_command({self._command: value})
+        # Show the value right away, send command via API (batched, confirmed by PVAL)
+        success = await self.coordinator.async_write_value(self._state_key, {self._command: value}, value)
 
         if success:
             _LOGGER.info("Successfully sent command for %s = %s", self._attr_name, value)
-            # Request data refresh to update state
-            await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error("Failed to send command for %s", self._attr_name)
-
-    @property
-    def available(self):
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
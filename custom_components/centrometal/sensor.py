@@ -1,5 +1,6 @@
 """Sensor platform for Centrometal boiler."""
 import logging
+from datetime import timedelta
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -7,12 +8,22 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN
-from .sensor_definitions import ALL_SENSORS, TEMPERATURE_SENSORS, COUNTER_SENSORS
+from .aggregates import AGGREGATE_STATS, aggregate_key
+from .const import DOMAIN, METRICS_SENSOR_INTERVAL
+from .derived import BURNER_WORK_KEY
+from .entity import CentrometalEntity
+from .sensor_definitions import (
+    ALL_SENSORS,
+    COUNTER_SENSORS,
+    DERIVED_SENSORS,
+    METRIC_SENSORS,
+    TEMPERATURE_SENSORS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,27 +36,61 @@ async def async_setup_entry(
     """Set up Centrometal sensor entities."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    sensors = []
+    # Sensors are only created for keys the boiler actually reports. The
+    # restored cache holds every key seen before, so they come back at startup.
+    created = set()
 
-    # Create sensors for all defined parameters
-    for param_key, sensor_config in ALL_SENSORS.items():
-        sensors.append(
-            CentrometalSensor(
-                coordinator,
-                entry,
-                param_key,
-                sensor_config,
+    @callback
+    def async_add_new_sensors(keys) -> None:
+        """Create sensors for keys seen for the first time."""
+        sensors = []
+        for param_key in keys:
+            sensor_config = ALL_SENSORS.get(param_key)
+            if sensor_config is None or param_key in created:
+                continue
+            created.add(param_key)
+            sensors.append(
+                CentrometalSensor(
+                    coordinator,
+                    entry,
+                    param_key,
+                    sensor_config,
+                )
             )
-        )
+
+            # Windowed companions of fast channels, when enabled in the options
+            if coordinator.aggregates is not None and param_key in coordinator.aggregates:
+                sensors.extend(
+                    CentrometalAggregateSensor(coordinator, entry, param_key, sensor_config, minutes, stat)
+                    for minutes in coordinator.aggregates.windows
+                    for stat in AGGREGATE_STATS
+                )
+
+            # Estimates computed from the burner counters
+            if param_key == BURNER_WORK_KEY:
+                sensors.extend(
+                    CentrometalDerivedSensor(coordinator, entry, derived_key, derived_config)
+                    for derived_key, derived_config in DERIVED_SENSORS.items()
+                )
+
+        if sensors:
+            _LOGGER.info("Created %d Centrometal sensors", len(sensors))
+            async_add_entities(sensors)
+
+    async_add_new_sensors(list(coordinator.data or {}))
+    entry.async_on_unload(coordinator.async_add_new_keys_listener(async_add_new_sensors))
 
     # Add status sensor
-    sensors.append(CentrometalStatusSensor(coordinator, entry))
+    async_add_entities([CentrometalStatusSensor(coordinator, entry)])
 
-    _LOGGER.info("Created %d Centrometal sensors", len(sensors))
-    async_add_entities(sensors)
+    # Add diagnostic metric sensors (disabled by default)
+    async_add_entities(
+        CentrometalMetricSensor(coordinator, entry, metric, metric_config)
+        for metric, metric_config in METRIC_SENSORS.items()
+    )
 
 
-class CentrometalSensor(CoordinatorEntity, SensorEntity):
+class CentrometalSensor(CentrometalEntity, SensorEntity):
     """Representation of a Centrometal sensor."""
 
     def __init__(self, coordinator, entry, param_key, sensor_config):
@@ -54,6 +99,7 @@ class CentrometalSensor(CoordinatorEntity, SensorEntity):
 
         self._param_key = param_key
         self._sensor_config = sensor_config
+        self._listen_keys = (param_key,)
 
         device_id = entry.data.get("device_id", entry.entry_id)
 
@@ -76,43 +122,150 @@ class CentrometalSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if not self.coordinator.data:
+        # Decoded once at ingest by the coordinator (see VALUE_CONVERTERS)
+        return self.coordinator.values.get(self._param_key)
+
+    @property
+    def available(self):
+        """Return if entity is available."""
+        return super().available and self.coordinator.data is not None
+
+
+class CentrometalAggregateSensor(CentrometalEntity, SensorEntity):
+    """Min, max or mean of a fast channel over a fixed window."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, entry, param_key, sensor_config, minutes, stat):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+
+        self._param_key = param_key
+        self._minutes = minutes
+        self._stat_index = AGGREGATE_STATS.index(stat)
+        self._listen_keys = (aggregate_key(param_key, minutes),)
+
+        device_id = entry.data.get("device_id", entry.entry_id)
+
+        self._attr_name = f"Centrometal {sensor_config['name']} {stat.capitalize()} {minutes} min"
+        self._attr_unique_id = f"centrometal_{device_id}_{param_key}_{stat}_{minutes}m"
+        self._attr_icon = sensor_config["icon"]
+        self._attr_native_unit_of_measurement = sensor_config["unit"]
+        self._attr_device_class = sensor_config["device_class"]
+
+    @property
+    def native_value(self):
+        """Return the statistic of the last completed window."""
+        result = self.coordinator.aggregates.result(self._param_key, self._minutes)
+        if result is None:
             return None
+        return round(result[self._stat_index], 2)
+
+
+class CentrometalDerivedSensor(CentrometalEntity, SensorEntity):
+    """Energy, pellet or burner statistic derived from the boiler counters."""
 
-        value = self.coordinator.data.get(self._param_key)
+    def __init__(self, coordinator, entry, derived_key, sensor_config):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
 
+        self._attribute = derived_key.removeprefix("derived_")
+        self._listen_keys = (derived_key,)
+
+        device_id = entry.data.get("device_id", entry.entry_id)
+
+        self._attr_name = f"Centrometal {sensor_config['name']}"
+        self._attr_unique_id = f"centrometal_{device_id}_{derived_key}"
+        self._attr_icon = sensor_config["icon"]
+        self._attr_native_unit_of_measurement = sensor_config["unit"]
+        self._attr_device_class = sensor_config["device_class"]
+        self._attr_state_class = sensor_config["state_class"]
+
+    @property
+    def native_value(self):
+        """Return the derived value."""
+        value = getattr(self.coordinator.derived, self._attribute)
         if value is None:
             return None
+        return round(value, 2)
+
+
+class CentrometalMetricSensor(CentrometalEntity, SensorEntity):
+    """Counter or latency percentile of the integration's own hot paths."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
 
-        # Filter out invalid temperature readings (-55 = sensor not connected)
-        if self._sensor_config["device_class"] == SensorDeviceClass.TEMPERATURE:
-            try:
-                if float(value) == -55:
-                    return None
-            except (ValueError, TypeError):
-                pass
-
-        # Convert binary values to ON/OFF for display
-        if self._param_key in ["K1B_onOff", "K2B_onOff", "B_P1", "B_P2", "B_P3",
-                                "K1B_P", "K2B_P", "B_cm2k", "B_zar", "B_zahP1",
-                                "B_zahP2", "B_zahP3"]:
-            try:
-                return "ON" if int(value) else "OFF"
-            except (ValueError, TypeError):
-                return value
-
-        return value
+    def __init__(self, coordinator, entry, metric, sensor_config):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+
+        self._metric = metric
+        self._stat = sensor_config["stat"]
+        self._source = sensor_config["source"]
+
+        device_id = entry.data.get("device_id", entry.entry_id)
+
+        self._attr_name = f"Centrometal {sensor_config['name']}"
+        self._attr_unique_id = f"centrometal_{device_id}_metric_{metric}"
+        self._attr_icon = sensor_config["icon"]
+        self._attr_native_unit_of_measurement = sensor_config["unit"]
+        if self._stat is None:
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        else:
+            self._attr_device_class = SensorDeviceClass.DURATION
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh the state periodically, metrics change on every message."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_refresh, timedelta(seconds=METRICS_SENSOR_INTERVAL)
+            )
+        )
+
+    @callback
+    def _async_refresh(self, now=None) -> None:
+        """Write the current metric value."""
+        self.async_write_ha_state()
 
     @property
-    def available(self):
-        """Return if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.data is not None
+    def _metrics(self):
+        """Return the metrics the sensor reads from."""
+        if self._source == "portal":
+            return self.coordinator.api.metrics
+        return self.coordinator.metrics
+
+    @property
+    def native_value(self):
+        """Return the counter or the latency percentile in milliseconds."""
+        if self._stat is None:
+            return self._metrics.counters.get(self._metric, 0)
+        seconds = self._metrics.percentile(self._metric, self._stat)
+        if seconds is None:
+            return None
+        return round(seconds * 1000, 1)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the full latency summary."""
+        histogram = self._metrics.histograms.get(self._metric)
+        if histogram is None:
+            return None
+        summary = histogram.as_dict()
+        summary.pop("buckets", None)
+        return summary
 
 
-class CentrometalStatusSensor(CoordinatorEntity, SensorEntity):
+class CentrometalStatusSensor(CentrometalEntity, SensorEntity):
     """Status sensor for Centrometal boiler with comprehensive attributes."""
 
     _attr_icon = "mdi:information"
+    _listen_keys = (
+        "B_STATE", "B_PRODNAME", "B_BRAND", "B_INST", "B_sng", "B_WifiVER",
+        "B_VER", "B_KONF", "B_SUP_TYPE", "K1B_CircType", "K2B_CircType",
+    )
 
     def __init__(self, coordinator, entry):
         """Initialize the sensor."""
@@ -154,4 +307,4 @@ class CentrometalStatusSensor(CoordinatorEntity, SensorEntity):
     @property
     def available(self):
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.data is not None
+        return super().available and self.coordinator.data is not None
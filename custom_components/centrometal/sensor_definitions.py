@@ -1,6 +1,7 @@
 """Sensor definitions with friendly names from reference implementation."""
 from homeassistant.components.sensor import SensorDeviceClass
-from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfTime
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfMass, UnitOfTemperature, UnitOfTime
 
 # Temperature sensors (based on 9a4gl/hass-centrometal-boiler)
 TEMPERATURE_SENSORS = {
@@ -39,6 +40,8 @@ TEMPERATURE_SENSORS = {
         "unit": UnitOfTemperature.CELSIUS,
         "icon": "mdi:thermometer",
         "device_class": SensorDeviceClass.TEMPERATURE,
+        "deadband": 2.0,
+        "aggregate": True,
     },
     "B_Ths1": {
         "name": "Hydraulic Crossover",
@@ -57,6 +60,7 @@ TEMPERATURE_SENSORS = {
         "unit": UnitOfTemperature.CELSIUS,
         "icon": "mdi:thermometer",
         "device_class": SensorDeviceClass.TEMPERATURE,
+        "deadband": 5.0,
     },
     "K1B_Tpol": {
         "name": "Circuit 1 Temperature",
@@ -173,12 +177,15 @@ MISC_SENSORS = {
         "unit": "rpm",
         "icon": "mdi:fan",
         "device_class": None,
+        "aggregate": True,
     },
     "B_Oxy1": {
         "name": "Lambda Sensor",
         "unit": "% O2",
         "icon": "mdi:gas-cylinder",
         "device_class": None,
+        "deadband": 0.3,
+        "aggregate": True,
     },
     "B_cm2k": {
         "name": "CM2K Status",
@@ -227,12 +234,14 @@ MISC_SENSORS = {
         "unit": PERCENTAGE,
         "icon": "mdi:air-filter",
         "device_class": None,
+        "aggregate": True,
     },
     "B_secS": {
         "name": "Air Flow Engine Secondary",
         "unit": PERCENTAGE,
         "icon": "mdi:air-filter",
         "device_class": None,
+        "aggregate": True,
     },
     "B_zar": {
         "name": "Glow",
@@ -308,3 +317,175 @@ ALL_SENSORS = {
     **COUNTER_SENSORS,
     **MISC_SENSORS,
 }
+
+# Sensors computed from the counters by DerivedTracker, keyed like the keys its update() returns
+DERIVED_SENSORS = {
+    "derived_energy": {
+        "name": "Heat Energy (Estimated)",
+        "unit": UnitOfEnergy.KILO_WATT_HOUR,
+        "icon": "mdi:fire",
+        "device_class": SensorDeviceClass.ENERGY,
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+    },
+    "derived_pellets": {
+        "name": "Pellet Consumption (Estimated)",
+        "unit": UnitOfMass.KILOGRAMS,
+        "icon": "mdi:grain",
+        "device_class": SensorDeviceClass.WEIGHT,
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+    },
+    "derived_duty_cycle": {
+        "name": "Burner Duty Cycle",
+        "unit": PERCENTAGE,
+        "icon": "mdi:percent",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+    "derived_starts_per_hour": {
+        "name": "Burner Starts per Hour",
+        "unit": "starts/h",
+        "icon": "mdi:counter",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+}
+
+# Diagnostic sensors over the ingest, portal and command metrics, disabled by default.
+# "source" is the coordinator (boiler) or the portal client, "stat" a latency
+# percentile or None for a counter; see metrics.Metrics
+METRIC_SENSORS = {
+    "mqtt_messages": {
+        "name": "MQTT Messages",
+        "unit": None,
+        "icon": "mdi:message-processing",
+        "source": "boiler",
+        "stat": None,
+    },
+    "mqtt_ingest": {
+        "name": "MQTT Ingest Latency",
+        "unit": UnitOfTime.MILLISECONDS,
+        "icon": "mdi:timer-outline",
+        "source": "boiler",
+        "stat": 0.95,
+    },
+    "status": {
+        "name": "Portal Status Latency",
+        "unit": UnitOfTime.MILLISECONDS,
+        "icon": "mdi:cloud-clock",
+        "source": "portal",
+        "stat": 0.95,
+    },
+    "command_confirm_mqtt": {
+        "name": "Command Confirmation Time",
+        "unit": UnitOfTime.MILLISECONDS,
+        "icon": "mdi:timer-check-outline",
+        "source": "boiler",
+        "stat": 0.95,
+    },
+}
+
+# Keys reporting 0/1 that are shown as ON/OFF
+BINARY_SENSOR_KEYS = frozenset({
+    "K1B_onOff", "K2B_onOff", "B_P1", "B_P2", "B_P3",
+    "K1B_P", "K2B_P", "B_cm2k", "B_zar", "B_zahP1",
+    "B_zahP2", "B_zahP3",
+})
+
+# Portal parameters written by the number and switch entities (state keys in number.py and switch.py)
+SETPOINT_KEYS = frozenset({"PVAL_3_0", "PVAL_10_0", "PVAL_140_0"})
+SWITCH_KEYS = frozenset({"PVAL_99_0", "PVAL_129_0"})
+
+# Temperature reported by a disconnected sensor
+TEMPERATURE_NOT_CONNECTED = -55
+
+# Temperature changes smaller than this are held back, unless a sensor sets its own "deadband"
+DEFAULT_TEMPERATURE_DEADBAND = 0.5
+
+# A value held back by its deadband is still published after this many seconds
+DEFAULT_HEARTBEAT = 600
+
+
+def convert_temperature(value):
+    """Return a temperature, or None when the sensor is not connected."""
+    try:
+        if float(value) == TEMPERATURE_NOT_CONNECTED:
+            return None
+    except (ValueError, TypeError):
+        pass
+    return value
+
+
+def convert_binary(value):
+    """Return ON/OFF for a 0/1 value."""
+    try:
+        return "ON" if int(value) else "OFF"
+    except (ValueError, TypeError):
+        return value
+
+
+def convert_counter(value):
+    """Return a counter as an integer when possible."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return value
+
+
+def convert_plain(value):
+    """Return the value unchanged."""
+    return value
+
+
+def convert_float(value):
+    """Return a float setpoint, or None if it can't be parsed."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def convert_switch(value):
+    """Return 1 for a switch that is on and 0 otherwise."""
+    try:
+        return 1 if int(value) == 1 else 0
+    except (ValueError, TypeError):
+        return 0
+
+
+def _build_converters():
+    """Map every sensor key to its decode function."""
+    converters = {}
+    for key, config in ALL_SENSORS.items():
+        if config["device_class"] == SensorDeviceClass.TEMPERATURE:
+            converters[key] = convert_temperature
+        elif key in BINARY_SENSOR_KEYS:
+            converters[key] = convert_binary
+        elif key in COUNTER_SENSORS:
+            converters[key] = convert_counter
+        else:
+            converters[key] = convert_plain
+    converters.update(dict.fromkeys(SETPOINT_KEYS, convert_float))
+    converters.update(dict.fromkeys(SWITCH_KEYS, convert_switch))
+    return converters
+
+
+# Built once, applied by the coordinator when values arrive
+VALUE_CONVERTERS = _build_converters()
+
+
+def _build_deadbands():
+    """Map every noisy analog sensor key to its deadband."""
+    deadbands = {}
+    for key, config in ALL_SENSORS.items():
+        if "deadband" in config:
+            deadbands[key] = config["deadband"]
+        elif config["device_class"] == SensorDeviceClass.TEMPERATURE:
+            deadbands[key] = DEFAULT_TEMPERATURE_DEADBAND
+    return deadbands
+
+
+# Default deadbands, overridable per sensor in the options
+SENSOR_DEADBANDS = _build_deadbands()
+
+# Fast channels that get windowed min/max/mean companion sensors when enabled
+AGGREGATE_KEYS = frozenset(key for key, config in ALL_SENSORS.items() if config.get("aggregate"))
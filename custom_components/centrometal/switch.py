@@ -5,9 +5,9 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .entity import CentrometalEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,7 +45,7 @@ async def async_setup_entry(
     async_add_entities(switches)
 
 
-class CentrometalSwitch(CoordinatorEntity, SwitchEntity):
+class CentrometalSwitch(CentrometalEntity, SwitchEntity):
     """Representation of a Centrometal switch."""
 
     def __init__(
@@ -63,6 +63,7 @@ class CentrometalSwitch(CoordinatorEntity, SwitchEntity):
         super().__init__(coordinator)
         self._command = command
         self._state_key = state_key
+        self._listen_keys = (state_key,)
         self._attr_name = f"Centrometal {name}"
         self._attr_unique_id = f"centrometal_{entry.data.get('device_id', entry.entry_id)}_{switch_id}"
         self._attr_icon = icon
@@ -72,26 +73,20 @@ class CentrometalSwitch(CoordinatorEntity, SwitchEntity):
     @property
     def is_on(self):
         """Return true if switch is on."""
-        value = self.coordinator.data.get(self._state_key)
+        value = self.coordinator.values.get(self._state_key)
         if value is None:
             return None
-        # Convert to int and check if 1
-        try:
-            return int(value) == 1
-        except (ValueError, TypeError):
-            return False
+        return value == 1
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
         _LOGGER.info("Turning on %s (command: %s = 1)", self._attr_name, self._command)
 
-        # Send command via API
-        success = await self.coordinator.api.send_command({self._command: 1})
+        # Show the state right away, send command via API (batched, confirmed by PVAL)
+        success = await self.coordinator.async_write_value(self._state_key, {self._command: 1}, 1)
 
         if success:
             _LOGGER.info("Successfully sent ON command for %s", self._attr_name)
-            # Request data refresh to update state
-            await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error("Failed to send ON command for %s", self._attr_name)
 
@@ -99,17 +94,10 @@ class CentrometalSwitch(CoordinatorEntity, SwitchEntity):
         """Turn the switch off."""
         _LOGGER.info("Turning off %s (command: %s = 0)", self._attr_name, self._command)
 
-        # Send command via API
-        success = await self.coordinator.api.send_command({self._command: 0})
+        # Show the state right away, send command via API (batched, confirmed by PVAL)
+        success = await self.coordinator.async_write_value(self._state_key, {self._command: 0}, 0)
 
         if success:
             _LOGGER.info("Successfully sent OFF command for %s", self._attr_name)
-            # Request data refresh to update state
-            await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error("Failed to send OFF command for %s", self._attr_name)
-
-    @property
-    def available(self):
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
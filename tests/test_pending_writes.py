@@ -0,0 +1,59 @@
+"""Tests for optimistic writes of the Centrometal coordinator."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.centrometal import (
+    CentrometalDataUpdateCoordinator,
+    CentrometalMQTTClient,
+)
+from custom_components.centrometal.api import CentrometalAPI
+from custom_components.centrometal.cache import CentrometalStateCache
+from custom_components.centrometal.const import DEFAULT_INSTALL_ID
+
+
+async def _write(config_dir: str, current, requested):
+    """Write requested over current and return (result, pending keys, shown value, timeouts)."""
+    hass = HomeAssistant(config_dir)
+    api = CentrometalAPI("test@example.com", "test", DEFAULT_INSTALL_ID)
+    mqtt_client = CentrometalMQTTClient(hass, DEFAULT_INSTALL_ID, "TEST0001")
+    coordinator = CentrometalDataUpdateCoordinator(
+        hass, api, mqtt_client, CentrometalStateCache(hass, "test")
+    )
+    coordinator.data = {"PVAL_10_0": current}
+
+    async def accept(command):
+        return True
+
+    coordinator.async_send_command = accept
+    try:
+        result = await asyncio.wait_for(
+            coordinator.async_write_value("PVAL_10_0", {"PWR 10": requested}, requested, wait_applied=True),
+            0.5,
+        )
+    except asyncio.TimeoutError:
+        result = None
+    pending = list(coordinator._pending_writes)
+    shown = coordinator.data["PVAL_10_0"]
+    timeouts = coordinator.metrics.counters.get("command_timeouts", 0)
+    for write in coordinator._pending_writes.values():
+        write.finish(False)
+    await api.close()
+    return result, pending, shown, timeouts
+
+
+def test_same_value_write_is_confirmed_at_once(tmp_path):
+    """A write of the value the boiler already reports needs no confirmation."""
+    result, pending, shown, timeouts = asyncio.run(_write(str(tmp_path), "55", 55))
+    assert result is True
+    assert pending == []
+    assert shown == 55
+    assert timeouts == 0
+
+
+def test_changed_value_write_waits_for_confirmation(tmp_path):
+    """A write of a new value stays pending until the boiler reports it."""
+    result, pending, shown, _ = asyncio.run(_write(str(tmp_path), "55", 60))
+    assert result is None
+    assert pending == ["PVAL_10_0"]
+    assert shown == 60